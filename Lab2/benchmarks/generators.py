@@ -0,0 +1,18 @@
+"""
+Генераторы синтетических списков студентов для бенчмарков.
+"""
+import random
+from typing import Iterator
+from lab.models import Student
+from lab.io_utils import save_students_to_csv
+
+def synthetic_students(count: int, grades: int = 5, seed: int = 42) -> Iterator[Student]:
+    """Студенты с id 0..count-1, повторяющимися фамилиями и случайными оценками."""
+    rnd = random.Random(seed)
+    surnames = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов", "Лебедев", "Козлов"]
+    for i in range(count):
+        yield Student(id=i, name=f"{rnd.choice(surnames)} {i % 1000}",
+                      grades=[rnd.randint(0, 100) for _ in range(rnd.randint(0, grades))])
+
+def write_roster_csv(filename: str, count: int, grades: int = 5, seed: int = 42) -> None:
+    save_students_to_csv(filename, list(synthetic_students(count, grades, seed)))
@@ -0,0 +1,122 @@
+"""
+Минимальный набор инструментов для бенчмарков: замер времени и пикового
+объёма памяти, хранение базовых значений в JSON и проверка на регрессию.
+Такой же модуль есть в Lab3/benchmarks/harness.py (лабораторные запускаются
+каждая из своего каталога): изменения вносятся в обе копии.
+"""
+import gc
+import json
+import os
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+class Result:
+    def __init__(self, name: str, seconds: float, peak_bytes: int):
+        self.name = name
+        self.seconds = seconds
+        self.peak_bytes = peak_bytes
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"seconds": self.seconds, "peak_bytes": self.peak_bytes}
+
+def measure(name: str, func: Callable[[], object], setup: Optional[Callable[[], object]] = None,
+            repeat: int = 3) -> Result:
+    """
+    Время - лучшее из repeat запусков без трассировки памяти;
+    пиковая память - отдельный запуск под tracemalloc (он сильно замедляет код).
+    setup вызывается перед каждым запуском и в замер не входит.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return Result(name, best, peak)
+
+def print_results(results: List[Result]) -> None:
+    width = max((len(r.name) for r in results), default=10)
+    for r in results:
+        print(f"{r.name:<{width}}  {r.seconds * 1000:10.2f} мс  {r.peak_bytes / 2**20:9.2f} МБ")
+
+def save_baseline(path: str, results: List[Result]) -> None:
+    baseline = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            baseline = json.load(f)
+    baseline.update({r.name: r.to_dict() for r in results})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+
+# Абсолютные допуски, чтобы шум на очень быстрых замерах не считался регрессией
+MIN_SECONDS_SLACK = 0.001
+MIN_BYTES_SLACK = 64 * 1024
+
+# Код выхода --check, когда сравнивать не с чем: нет файла базовых значений
+# или в нём нет ни одного из замеров (1 - найдены регрессии)
+EXIT_NO_BASELINE = 2
+
+def check_baseline(path: str, results: List[Result], threshold: float) -> Tuple[List[str], List[str]]:
+    """
+    Сравнение с базовыми значениями. Возвращает список регрессий (время или
+    память выросли больше чем на threshold, доля) и имена замеров, которых
+    нет в базовых значениях.
+    """
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions, missing = [], []
+    for r in results:
+        base = baseline.get(r.name)
+        if base is None:
+            missing.append(r.name)
+            continue
+        if r.seconds > base["seconds"] * (1 + threshold) + MIN_SECONDS_SLACK:
+            regressions.append(f"{r.name}: время {base['seconds'] * 1000:.2f} -> {r.seconds * 1000:.2f} мс")
+        if r.peak_bytes > base["peak_bytes"] * (1 + threshold) + MIN_BYTES_SLACK:
+            regressions.append(f"{r.name}: память {base['peak_bytes']} -> {r.peak_bytes} байт")
+    return regressions, missing
+
+def add_arguments(parser, baseline: str) -> None:
+    """Общие аргументы командной строки; baseline - путь к базовым значениям по умолчанию."""
+    parser.add_argument("--baseline", default=baseline, help="JSON с базовыми значениями")
+    parser.add_argument("--save-baseline", action="store_true", help="Записать результаты как базовые")
+    parser.add_argument("--check", action="store_true", help="Сравнить с базовыми и упасть при регрессии")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Допустимый рост (доля, по умолчанию 0.25)")
+    parser.add_argument("--repeat", type=int, default=3)
+
+def finish(args, results: List[Result]) -> int:
+    """
+    Печать, сохранение и проверка по аргументам командной строки.
+    Код выхода: 0 - норма, 1 - регрессия, EXIT_NO_BASELINE - не с чем сравнить.
+    """
+    print_results(results)
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Базовые значения сохранены в {args.baseline}")
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"Нет базовых значений {args.baseline}: сначала запустите с --save-baseline.")
+            return EXIT_NO_BASELINE
+        regressions, missing = check_baseline(args.baseline, results, args.threshold)
+        for name in missing:
+            print(f"[Нет базовых значений] {name}")
+        for line in regressions:
+            print(f"[Регрессия] {line}")
+        if regressions:
+            return 1
+        if len(missing) == len(results):
+            print(f"Ни одного замера нет в {args.baseline}: сохраните их с --save-baseline.")
+            return EXIT_NO_BASELINE
+        print("Регрессий нет.")
+    return 0
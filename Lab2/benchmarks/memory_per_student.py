@@ -0,0 +1,40 @@
+"""
+Сравнение памяти на одного студента: Student (dataclass + list)
+и CompactStudent (__slots__ + array('B')).
+
+Запуск из каталога Lab2:
+    python -m benchmarks.memory_per_student [--count N] [--grades K]
+"""
+import argparse
+import random
+import tracemalloc
+from lab.models import Student, CompactStudent
+
+def bytes_per_student(cls: type, count: int, grades_per_student: int) -> float:
+    rnd = random.Random(42)
+    rows = [(i, f"Студент {i}", [rnd.randint(0, 100) for _ in range(grades_per_student)])
+            for i in range(count)]
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    students = [cls(s_id, name, list(grades)) for s_id, name, grades in rows]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Оценки копируются внутри замера, а имена разделяются с исходными строками,
+    # поэтому в результат входят объекты, контейнеры оценок и кеши, но не текст имён.
+    del rows
+    return (after - before) / len(students)
+
+def main():
+    parser = argparse.ArgumentParser(description="Память на одного студента")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--grades", type=int, default=10)
+    args = parser.parse_args()
+
+    for cls in (Student, CompactStudent):
+        size = bytes_per_student(cls, args.count, args.grades)
+        print(f"{cls.__name__:<15} {size:8.1f} байт/студент")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Бенчмарки lab.io_utils и lab.processing на синтетических списках.
+
+Запуск из каталога Lab2:
+    python -m benchmarks.roster [--sizes 1000,10000,100000] [--save-baseline | --check]
+
+Размеры до 1e7 поддерживаются, но требуют нескольких ГБ памяти.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from lab import io_utils, processing as proc
+from benchmarks import harness
+from benchmarks.generators import synthetic_students
+
+def bench_size(n: int, workdir: str, repeat: int):
+    students = list(synthetic_students(n))
+    csv_path = os.path.join(workdir, f"roster_{n}.csv")
+    results = []
+
+    def run(name, func, setup=None):
+        results.append(harness.measure(f"{name}[{n}]", func, setup, repeat))
+
+    run("save_csv", lambda: io_utils.save_students_to_csv(csv_path, students))
+    run("load_csv", lambda: io_utils.load_students_from_csv(csv_path))
+    run("calculate_stats", lambda: proc.calculate_stats(students))
+    for key in ("avg", "name", "id"):
+        run(f"sort_students_{key}", lambda key=key: proc.sort_students(students, key))
+    run("get_top_n", lambda: proc.get_top_n(students, 10))
+
+    # Те же запросы на реестре с сортированными индексами
+    indexed = proc.StudentRegistry(students)
+    indexed.subscribe(proc.Leaderboard())
+    for key in ("name", "id"):
+        indexed.subscribe(proc.SortIndex(key))
+    for key in ("avg", "name", "id"):
+        run(f"sort_students_{key}_indexed", lambda key=key: proc.sort_students(indexed, key))
+    run("avg_range_indexed", lambda: proc.students_in_avg_range(indexed, 60, 61))
+    run("page_name_indexed", lambda: proc.page_students(indexed, "name", n // 2, 50))
+
+    # Смешанная нагрузка: добавление, обновление и удаление на реестре с индексами
+    state = {}
+    ops = 1000
+
+    def churn_setup():
+        registry = proc.StudentRegistry(students)
+        registry.subscribe(proc.Leaderboard())
+        registry.subscribe(proc.GroupStats())
+        state["registry"] = registry
+
+    def churn():
+        registry = state["registry"]
+        rnd = random.Random(7)
+        for i in range(ops):
+            new_id = n + i
+            proc.add_student(registry, new_id, "Новый студент")
+            proc.update_grades(registry, rnd.randrange(n), [rnd.randint(0, 100) for _ in range(3)])
+            proc.delete_student(registry, new_id)
+        proc.calculate_stats(registry)
+        proc.get_top_n(registry, 10)
+
+    run(f"churn_{ops}", churn, churn_setup)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки Student Manager")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Размеры списков через запятую (например, 1000,1000000)")
+    harness.add_arguments(parser, os.path.join(os.path.dirname(__file__), "baseline.json"))
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in (int(float(s)) for s in args.sizes.split(",")):
+            results.extend(bench_size(n, workdir, args.repeat))
+    sys.exit(harness.finish(args, results))
+
+if __name__ == "__main__":
+    main()
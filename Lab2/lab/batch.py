@@ -0,0 +1,172 @@
+"""
+Пакетный (неинтерактивный) режим: операции читаются из файла JSON Lines
+или CSV и применяются по порядку, результат каждой - строка JSON.
+
+Операции и их поля:
+    add            id, name[, grades]
+    delete         id
+    update_grades  id, grades
+    sort           key (avg | name | id)
+    stats
+    export_top     n, file
+
+В CSV первая строка - заголовок с именами полей (op,id,name,grades,key,n,file),
+оценки перечисляются через пробел; пустая ячейка grades - пустой список
+оценок. Подряд идущие изменения (add, delete, update_grades) применяются
+группой (StudentRegistry.bulk): индексы реестра приводятся в порядок один
+раз после группы, а не на каждую операцию.
+"""
+import csv
+import json
+import re
+import sys
+from itertools import groupby
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from lab.models import Student
+from lab.errors import AppError, DataSourceError, ValidationError
+import lab.io_utils as io
+import lab.processing as proc
+
+MUTATIONS = {"add", "delete", "update_grades"}
+INT_FIELDS = ("id", "n")
+SORT_KEYS = ("avg", "name", "id")
+
+Operation = Tuple[int, Dict[str, Any]]
+
+def read_operations(filename: str) -> Iterator[Operation]:
+    """
+    Читает операции из файла (*.csv - CSV, иначе JSON Lines; "-" - stdin).
+    Возвращает пары (номер строки, операция); битая строка JSON даёт
+    операцию с полем "error", чтобы о ней сообщил run_batch.
+    """
+    if filename == "-":
+        return _read_jsonl(sys.stdin)
+    try:
+        f = open(filename, mode='r', encoding='utf-8', newline='')
+    except IOError as e:
+        raise DataSourceError(f"Ошибка открытия файла операций: {e}")
+    return _read_file(f, filename.endswith(".csv"))
+
+def _read_file(f: TextIO, is_csv: bool) -> Iterator[Operation]:
+    with f:
+        yield from (_read_csv(f) if is_csv else _read_jsonl(f))
+
+def _read_jsonl(f: TextIO) -> Iterator[Operation]:
+    for line_idx, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            op = json.loads(line)
+        except ValueError as e:
+            op = {"error": f"некорректный JSON: {e}"}
+        if not isinstance(op, dict):
+            op = {"error": "операция должна быть объектом JSON"}
+        yield line_idx, op
+
+def _read_csv(f: TextIO) -> Iterator[Operation]:
+    reader = csv.DictReader(f)
+    for row in reader:
+        op = {k: v.strip() for k, v in row.items() if k and v is not None and v.strip()}
+        if op:
+            if row.get("grades") is not None:
+                op.setdefault("grades", "")
+            for field in INT_FIELDS:
+                if re.fullmatch(r"[+-]?[0-9]+", op.get(field, "")):
+                    op[field] = int(op[field])
+            yield reader.line_num, op
+
+def _int(op: Dict[str, Any], field: str) -> int:
+    """Целое поле операции; строки из цифр в CSV переводит в int _read_csv."""
+    value = op[field]
+    if type(value) is int:  # bool - тоже int
+        return value
+    raise ValidationError(f"Поле {field} должно быть целым числом (получено: {value!r}).")
+
+def _grades(value: Any) -> List[int]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [int(x) for x in value.split()]
+    if not isinstance(value, list) or not all(type(g) is int for g in value):  # bool - тоже int
+        raise ValidationError(f"Оценки должны быть списком целых чисел (получено: {value!r}).")
+    return value
+
+def _student_json(s: Optional[Student]) -> Optional[Dict[str, Any]]:
+    if s is None:
+        return None
+    return {"id": s.id, "name": s.name, "average": round(s.average, 2)}
+
+def _mutate(students: proc.StudentRegistry, op: Dict[str, Any]) -> Dict[str, Any]:
+    kind = op["op"]
+    s_id = _int(op, "id")
+    if kind == "add":
+        students.add(Student(id=s_id, name=op["name"], grades=_grades(op.get("grades"))))
+    elif kind == "delete":
+        students.remove(s_id)
+    else:
+        proc.update_grades(students, s_id, _grades(op["grades"]))
+    return {"id": s_id}
+
+def _new_registry(students: List[Student], key: str) -> proc.StudentRegistry:
+    return proc.StudentRegistry(students)
+
+def _query(students: proc.StudentRegistry, op: Dict[str, Any],
+           make_registry: Callable[[List[Student], str], proc.StudentRegistry]
+           ) -> Tuple[proc.StudentRegistry, Dict[str, Any]]:
+    kind = op["op"]
+    if kind == "sort":
+        key = op.get("key", "")
+        if key not in SORT_KEYS:
+            raise ValidationError(f"Неверный критерий сортировки: {key!r}")
+        students = make_registry(proc.sort_students(students, key), key)
+        return students, {"count": len(students)}
+    if kind == "stats":
+        stats = proc.calculate_stats(students)
+        return students, {"count": stats["count"], "overall_avg": round(stats["overall_avg"], 2),
+                          "best": _student_json(stats["best"]), "worst": _student_json(stats["worst"])}
+    if kind == "export_top":
+        top_s = proc.get_top_n(students, _int(op, "n"))
+        io.export_top_students(op["file"], top_s)
+        return students, {"file": op["file"], "count": len(top_s)}
+    raise ValidationError(f"Неизвестная операция: {kind!r}")
+
+def _run(func: Callable[[], Dict[str, Any]], line_idx: int, op: Dict[str, Any]) -> Dict[str, Any]:
+    result = {"line": line_idx, "op": op.get("op")}
+    try:
+        if "error" in op:
+            raise ValidationError(op["error"])
+        result.update(func())
+        result["ok"] = True
+    except (AppError, KeyError, ValueError, TypeError) as e:
+        result["ok"] = False
+        result["error"] = f"не указано поле {e}" if isinstance(e, KeyError) else str(e)
+    return result
+
+def run_batch(students: proc.StudentRegistry, operations: Iterable[Operation], out: TextIO,
+              make_registry: Callable[[List[Student], str], proc.StudentRegistry] = _new_registry
+              ) -> Tuple[proc.StudentRegistry, int]:
+    """
+    Применяет операции к реестру и пишет в out по строке JSON на операцию:
+    {"line", "op", "ok", ...} или {"line", "op", "ok": false, "error"}.
+    Ошибка в одной операции не останавливает обработку.
+    make_registry(students, key) создаёт новый реестр после сортировки по key.
+    Возвращает итоговый реестр и число неудачных операций.
+    """
+    failed = 0
+    for is_mutation, group in groupby(operations, key=lambda item: item[1].get("op") in MUTATIONS):
+        if is_mutation:
+            with students.bulk():
+                results = [_run(lambda: _mutate(students, op), i, op) for i, op in group]
+        else:
+            results = []
+            for i, op in group:
+                def query() -> Dict[str, Any]:
+                    nonlocal students
+                    students, payload = _query(students, op, make_registry)
+                    return payload
+                results.append(_run(query, i, op))
+
+        for result in results:
+            failed += not result["ok"]
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return students, failed
@@ -0,0 +1,77 @@
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from lab.models import Student
+
+class GradeStore:
+    """
+    Колоночное хранилище студентов.
+    id и имена лежат в отдельных столбцах, оценки - в формате CSR:
+    массив смещений offsets (длина n+1) и один непрерывный массив values.
+    Оценки студента i: values[offsets[i]:offsets[i+1]].
+    """
+
+    def __init__(self, ids: np.ndarray, names: List[str],
+                 offsets: np.ndarray, values: np.ndarray):
+        self.ids = ids
+        self.names = names
+        self.offsets = offsets
+        self.values = values
+        self._averages: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_students(cls, students: Iterable[Student]) -> "GradeStore":
+        students = list(students)
+        n = len(students)
+        ids = np.fromiter((s.id for s in students), dtype=np.int64, count=n)
+        counts = np.fromiter((len(s.grades) for s in students), dtype=np.int64, count=n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        values = np.fromiter(chain.from_iterable(s.grades for s in students),
+                             dtype=np.int8, count=int(offsets[-1]))
+        return cls(ids, [s.name for s in students], offsets, values)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def grades(self, i: int) -> List[int]:
+        return self.values[self.offsets[i]:self.offsets[i + 1]].tolist()
+
+    def student(self, i: int) -> Student:
+        """Восстанавливает объект Student по номеру строки."""
+        return Student(id=int(self.ids[i]), name=self.names[i], grades=self.grades(i))
+
+    def averages(self) -> np.ndarray:
+        """Средние баллы всех студентов (0.0 для студентов без оценок)."""
+        if self._averages is None:
+            prefix = np.zeros(len(self.values) + 1, dtype=np.int64)
+            np.cumsum(self.values, dtype=np.int64, out=prefix[1:])
+            sums = prefix[self.offsets[1:]] - prefix[self.offsets[:-1]]
+            counts = np.diff(self.offsets)
+            self._averages = np.divide(sums, counts, out=np.zeros(len(self), dtype=np.float64),
+                                       where=counts > 0)
+        return self._averages
+
+    def overall_avg(self) -> float:
+        if len(self.values) == 0:
+            return 0.0
+        return float(self.values.sum(dtype=np.int64)) / len(self.values)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика в формате processing.calculate_stats.
+        При равных средних лучший - последний, худший - первый по порядку,
+        как при устойчивой сортировке по возрастанию среднего.
+        """
+        if len(self) == 0:
+            return {"count": 0, "overall_avg": 0.0, "best": None, "worst": None}
+
+        avgs = self.averages()
+        best = len(avgs) - 1 - int(np.argmax(avgs[::-1]))
+        worst = int(np.argmin(avgs))
+        return {
+            "count": len(self),
+            "overall_avg": self.overall_avg(),
+            "best": self.student(best),
+            "worst": self.student(worst)
+        }
@@ -1,24 +1,69 @@
 import csv
+import glob
 import os
-from typing import List, Optional
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 from lab.models import Student
-from lab.errors import DataSourceError, ValidationError
+from lab.errors import DataSourceError, DuplicateIdError, ValidationError
+from lab.metrics import METRICS, timed
 
-def load_students_from_csv(filename: str) -> List[Student]:
+@timed()
+def load_students_from_csv(filename: str, student_cls: type = Student) -> List[Student]:
     """
     Загружает список студентов из CSV файла.
     Поддерживает файлы с заголовком и без.
+    student_cls позволяет выбрать представление (например, CompactStudent).
+    """
+    return list(iter_students_from_csv(filename, student_cls=student_cls))
+
+def iter_students_from_csv(filename: str,
+                           batch_size: Optional[int] = None,
+                           student_cls: type = Student) -> Iterator[Union[Student, List[Student]]]:
+    """
+    Потоково читает студентов из CSV файла, не держа весь файл в памяти.
+    Без batch_size возвращает по одному Student, иначе - списки до batch_size штук.
     """
     if not os.path.exists(filename):
         raise DataSourceError(f"Файл не найден: {filename}")
 
-    students = []
-    
+    students = _iter_csv_rows(filename, student_cls)
+    if batch_size is None:
+        return students
+    return _batched(students, batch_size)
+
+def _batched(items: Iterable[Student], size: int) -> Iterator[List[Student]]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+def detect_header(sample: str) -> bool:
+    """
+    Есть ли в начале файла заголовок. csv.Sniffer не справляется с частью
+    файлов (например, с короткими строками); тогда заголовком считается
+    первая строка, если её первая ячейка - не число.
+    """
+    if not sample.strip():
+        return False
+    try:
+        return csv.Sniffer().has_header(sample)
+    except csv.Error:
+        first = sample.splitlines()[0].split(",", 1)[0].strip()
+        return not first.lstrip("-").isdigit()
+
+def _iter_csv_rows(filename: str, student_cls: type) -> Iterator[Student]:
+    start = time.perf_counter()
+    parsed = rejected = 0
     try:
         with open(filename, mode='r', encoding='utf-8', newline='') as f:
             # Читаем первую строку, чтобы понять, есть ли заголовок
             sample = f.read(1024)
-            has_header = csv.Sniffer().has_header(sample)
+            has_header = detect_header(sample)
             f.seek(0)
             
             reader = csv.reader(f)
@@ -31,6 +76,7 @@ def load_students_from_csv(filename: str) -> List[Student]:
                 
                 # Минимально должны быть id и name
                 if len(row) < 2:
+                    rejected += 1
                     continue  # Или можно кинуть предупреждение
 
                 try:
@@ -44,16 +90,225 @@ def load_students_from_csv(filename: str) -> List[Student]:
                         if val:  # Если ячейка не пустая
                             grades.append(int(val))
                     
-                    students.append(Student(id=s_id, name=name, grades=grades))
-                except ValueError as e:
+                    student = student_cls(id=s_id, name=name, grades=grades)
+                except (ValueError, ValidationError) as e:
                     # Логируем ошибку, но не роняем всё приложение, если одна строка битая
                     print(f"[Warning] Ошибка парсинга строки {row_idx}: {e}")
+                    rejected += 1
+                    continue
+                parsed += 1
+                yield student
                     
     except (IOError, csv.Error) as e:
         raise DataSourceError(f"Ошибка чтения CSV: {e}")
+    finally:
+        if METRICS.enabled:
+            METRICS.add_rows(parsed, rejected, time.perf_counter() - start)
+
+def expand_shards(pattern: str) -> List[str]:
+    """
+    Раскрывает путь к шардам: каталог (все *.csv в нём), glob-шаблон или один файл.
+    """
+    if os.path.isdir(pattern):
+        paths = glob.glob(os.path.join(pattern, "*.csv"))
+    elif any(c in pattern for c in "*?["):
+        paths = glob.glob(pattern)
+    else:
+        paths = [pattern]
+    if not paths:
+        raise DataSourceError(f"Не найдено ни одного файла: {pattern}")
+    return sorted(paths)
+
+@timed()
+def load_students_from_shards(paths: List[str], max_workers: Optional[int] = None) -> List[Student]:
+    """
+    Загружает несколько CSV-шардов параллельно в пуле процессов и объединяет
+    их в порядке paths. id должны быть уникальны во всех шардах.
+    Процессы возвращают шарды столбцами, объекты Student создаются здесь.
+    С одним процессом (max_workers=1 или одно ядро) шарды читаются подряд.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if len(paths) == 1 or workers == 1:
+        return _merge_shards(paths, map(load_students_from_csv, paths))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = (part.students() for part in pool.map(_load_shard_columns, paths))
+        return _merge_shards(paths, results)
+
+class _ShardColumns:
+    """
+    Студенты шарда в компактном виде (дёшево передаётся между процессами):
+    id и имена списками, оценки - одним массивом со смещениями.
+    """
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.names: List[str] = []
+        self.offsets = array('Q', [0])
+        self.grades = array('B')
+
+    def students(self) -> List[Student]:
+        grades, offsets = self.grades, self.offsets
+        return [Student(id=s_id, name=name, grades=grades[offsets[k]:offsets[k + 1]])
+                for k, (s_id, name) in enumerate(zip(self.ids, self.names))]
+
+def _load_shard_columns(path: str) -> _ShardColumns:
+    """Читает шард в столбцы (выполняется в процессе пула)."""
+    part = _ShardColumns()
+    for s in iter_students_from_csv(path):
+        part.ids.append(s.id)
+        part.names.append(s.name)
+        part.grades.extend(s.grades)
+        part.offsets.append(len(part.grades))
+    return part
+
+def _merge_shards(paths: List[str], results: Iterable[List[Student]]) -> List[Student]:
+    origin: Dict[int, str] = {}
+    merged: List[Student] = []
+    for path, students in zip(paths, results):
+        shard = os.path.basename(path)
+        for s in students:
+            if s.id in origin:
+                raise DuplicateIdError(f"Студент с ID {s.id} из {shard} уже загружен из {origin[s.id]}.")
+            origin[s.id] = shard
+        merged.extend(students)
+    return merged
+
+@timed()
+def load_grade_store_from_csv(filename: str):
+    """
+    Быстрая загрузка всего файла в колоночный GradeStore (pandas + numpy).
+    id и оценки сразу читаются числами (int64); только столбцы, где это не
+    удалось (пустые ячейки, дроби, текст), перечитываются строками и
+    разбираются по правилам int(). Проверки (id >= 0, непустое имя,
+    оценки 0..100) выполняются векторно. Некорректные строки пропускаются
+    с предупреждением и номером строки, как в load_students_from_csv.
+    """
+    import numpy as np
+    import pandas as pd
+    from lab.columnar import GradeStore
+
+    if not os.path.exists(filename):
+        raise DataSourceError(f"Файл не найден: {filename}")
+
+    start = time.perf_counter()
+    try:
+        with open(filename, mode='r', encoding='utf-8', newline='') as f:
+            sample = f.read(1024)
+            has_header = detect_header(sample)
+            f.seek(0)
+            width = max(len(next(csv.reader(f), [])), 2)
+
+        # Имена читаются строками, чтобы "NA" не превращалось в пропуск. Столбец
+        # чисел получает тип int64, только если каждая ячейка в нём - целое
+        # по правилам int(); иначе это float или строки
+        numeric = [c for c in range(width) if c != 1]
+        options = dict(header=None, names=range(width), skiprows=1 if has_header else 0,
+                       skip_blank_lines=False, keep_default_na=False, encoding='utf-8')
+        frame = pd.read_csv(filename, dtype={1: str}, na_values={c: [''] for c in numeric}, **options)
+        loose = [c for c in numeric if frame[c].dtype != np.int64]
+        text = pd.read_csv(filename, usecols=loose, dtype=str, **options) if loose else None
+    except pd.errors.ParserError:
+        # Строки длиннее заголовка: такой файл разбираем построчно
+        return GradeStore.from_students(load_students_from_csv(filename))
+    except (IOError, csv.Error) as e:
+        raise DataSourceError(f"Ошибка чтения CSV: {e}")
+
+    rows = len(frame)
+    values, ok, given = {}, {}, {}
+    for c in numeric:
+        if c in loose:
+            values[c], ok[c], given[c] = _parse_loose_column(frame[c], text[c])
+        else:
+            values[c] = frame[c].to_numpy()
+            ok[c] = given[c] = np.ones(rows, dtype=bool)
+
+    def stack(columns, dtype):
+        return np.column_stack(columns) if columns else np.zeros((rows, 0), dtype)
+
+    ids, id_ok = values[0], ok[0]
+    grades = stack([values[c] for c in range(2, width)], np.int64)
+    grade_ok = stack([ok[c] for c in range(2, width)], bool)
+    given_grades = stack([given[c] for c in range(2, width)], bool)
+    names = frame[1].fillna('').str.strip()
+
+    blank = ~given[0] & (names == '').to_numpy() & ~given_grades.any(axis=1)
+    bad = ~id_ok | (ids < 0)
+    bad |= (names == '').to_numpy()
+    bad |= (given_grades & ~(grade_ok & (grades >= 0) & (grades <= 100))).any(axis=1)
+    bad &= ~blank
 
-    return students
+    for i in np.flatnonzero(bad):
+        raw = {c: text[c].iat[i] for c in loose}
+        reason = _describe_bad_row(raw, id_ok[i], ids[i], names.iat[i],
+                                   grades[i], grade_ok[i], given_grades[i])
+        print(f"[Warning] Ошибка в строке {i + 1}: {reason}")
+
+    good = ~(bad | blank)
+    if METRICS.enabled:
+        METRICS.add_rows(int(good.sum()), int(bad.sum()), time.perf_counter() - start)
+    given = given_grades[good]
+    offsets = np.zeros(int(good.sum()) + 1, dtype=np.int64)
+    np.cumsum(given.sum(axis=1), out=offsets[1:])
+    return GradeStore(ids[good], names[good].tolist(), offsets, grades[good][given].astype(np.int8))
+
+# Наибольшее значение int64 для сравнения строк из 19 цифр
+_INT64_MAX = str(2 ** 63 - 1)
+
+def _parse_int_column(values):
+    """
+    Разбирает столбец строк как int(): только цифры с необязательным знаком,
+    без дробной части и экспоненты. Возвращает значения (int64) и маску
+    разобранных ячеек; числа вне int64 не разбираются.
+    """
+    import numpy as np
+
+    digits = values.str.lstrip('+-').str.lstrip('0')
+    length = digits.str.len()
+    ok = (values.str.fullmatch(r'[+-]?\d+')
+          & ((length < 19) | ((length == 19) & (digits <= _INT64_MAX)))).to_numpy()
+    return values.where(ok, '0').astype(np.int64).to_numpy(), ok
+
+def _parse_loose_column(numbers, text):
+    """
+    Столбец чисел, не прочитанный как int64: значения, маска разобранных
+    ячеек и маска непустых ячеек. Если столбец всё же прочитан как float
+    (пустые ячейки или запись вроде "80.0" / "1e2"), текст только
+    проверяется на целое, а значения берутся из float, пока они точны;
+    остальные ячейки разбираются из строк.
+    """
+    import numpy as np
+
+    cells = text.fillna('').str.strip()
+    given = (cells != '').to_numpy()
+    if numbers.dtype != np.float64:
+        values, ok = _parse_int_column(cells)
+        return values, ok, given
+    ok = cells.str.fullmatch(r'[+-]?\d+').to_numpy(dtype=bool, copy=True)
+    floats = numbers.to_numpy()
+    exact = ok & (np.abs(floats) < 2 ** 53)
+    values = np.where(exact, floats, 0).astype(np.int64)
+    rest = np.flatnonzero(ok & ~exact)
+    if len(rest):
+        values[rest], ok[rest] = _parse_int_column(cells.iloc[rest])
+    return values, ok, given
+
+def _describe_bad_row(raw, id_ok, s_id, name, grades, grade_ok, given) -> str:
+    """
+    Текст ошибки для строки, отбракованной векторной проверкой.
+    raw - исходный текст ячеек столбцов, перечитанных строками.
+    """
+    if not id_ok:
+        return f"некорректный id: {raw[0]!r}"
+    for pos, (present, ok) in enumerate(zip(given, grade_ok), start=2):
+        if present and not ok:
+            return f"некорректная оценка: {raw[pos]!r}"
+    try:
+        Student(id=int(s_id), name=name, grades=[int(g) for g, present in zip(grades, given) if present])
+    except ValidationError as e:
+        return str(e)
+    return "некорректные данные"
 
+@timed()
 def save_students_to_csv(filename: str, students: List[Student]):
     """
     Сохраняет список студентов в CSV.
@@ -79,7 +334,8 @@ def save_students_to_csv(filename: str, students: List[Student]):
     except IOError as e:
         raise DataSourceError(f"Ошибка записи в файл: {e}")
 
-def export_top_students(filename: str, students: List[Student]):
+@timed()
+def export_top_students(filename: str, students: Iterable[Student]):
     """
     Экспорт ТОП-N студентов в специальном формате:
     id, name, average, grades (строкой через пробел)
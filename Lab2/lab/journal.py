@@ -0,0 +1,153 @@
+"""
+Журналируемое хранение списка студентов.
+
+Базовый CSV-файл плюс журнал изменений (JSON Lines), куда дописываются
+операции add / delete / update_grades и сортировки sort. Сохранение стоит пропорционально
+изменению, а не размеру списка; периодически журнал сворачивается
+(компактируется) в базовый файл. При загрузке журнал проигрывается поверх базы.
+Перед заменой базы в журнал пишется отметка с отпечатком новой базы, так что
+сбой между заменой базы и очисткой журнала не приводит к повторному применению
+уже вошедших в базу записей.
+"""
+import hashlib
+import json
+import os
+from typing import List, Optional
+from lab.models import Student
+from lab.errors import DataSourceError, StudentNotFoundError
+from lab.io_utils import load_students_from_csv, save_students_to_csv
+from lab.processing import SORT_KEYS, StudentRegistry, sort_students
+
+class Journal:
+    """
+    Подписчик StudentRegistry, записывающий каждое изменение в журнал.
+    После compact_every записей журнал сворачивается в базовый CSV.
+    """
+
+    def __init__(self, base_filename: str, log_filename: Optional[str] = None,
+                 compact_every: int = 10000):
+        self.base_filename = base_filename
+        self.log_filename = log_filename or base_filename + ".log"
+        self.compact_every = compact_every
+        self._registry: Optional[StudentRegistry] = None
+        self._pending = 0
+        try:
+            self._log = open(self.log_filename, mode='a', encoding='utf-8')
+        except IOError as e:
+            raise DataSourceError(f"Ошибка открытия журнала: {e}")
+
+    def attach(self, registry: StudentRegistry) -> None:
+        """Подключает журнал к реестру; уже имеющиеся студенты не записываются."""
+        self._registry = registry
+        registry.subscribe(self, replay=False)
+
+    def _write(self, record: dict) -> None:
+        try:
+            self._log.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._log.flush()
+        except IOError as e:
+            raise DataSourceError(f"Ошибка записи в журнал: {e}")
+
+    def _append(self, record: dict) -> None:
+        self._write(record)
+        self._pending += 1
+        if self._pending >= self.compact_every:
+            self.compact()
+
+    def on_add(self, student: Student) -> None:
+        self._append({"op": "add", "id": student.id, "name": student.name, "grades": student.grades})
+
+    def on_remove(self, student: Student) -> None:
+        self._append({"op": "delete", "id": student.id})
+
+    def on_update(self, student: Student, old_grades: List[int]) -> None:
+        self._append({"op": "update_grades", "id": student.id, "grades": student.grades})
+
+    def record_sort(self, key: str) -> None:
+        """Записывает сортировку списка по key (порядок студентов тоже восстанавливается)."""
+        self._append({"op": "sort", "key": key})
+
+    def compact(self) -> None:
+        """
+        Переписывает базовый файл текущим состоянием реестра и очищает журнал.
+        Отметка compact с отпечатком новой базы пишется в журнал до её замены.
+        """
+        if self._registry is None:
+            return
+        tmp = self.base_filename + ".tmp"
+        save_students_to_csv(tmp, self._registry)
+        self._write({"op": "compact", "base": _fingerprint(tmp)})
+        os.replace(tmp, self.base_filename)
+        self._log.truncate(0)
+        self._log.seek(0)
+        self._pending = 0
+
+    def close(self) -> None:
+        self._log.close()
+
+def replay_journal(base_filename: str, log_filename: Optional[str] = None) -> StudentRegistry:
+    """
+    Загружает базовый CSV (если он есть) и применяет к нему записи журнала.
+    Недописанная последняя строка (обрыв записи) пропускается с предупреждением.
+    Если в журнале есть отметка compact с отпечатком текущей базы (сбой после
+    замены базы), записи до неё уже в базе и не применяются.
+    """
+    log_filename = log_filename or base_filename + ".log"
+    has_base = os.path.exists(base_filename)
+    registry = StudentRegistry(load_students_from_csv(base_filename) if has_base else [])
+    if not os.path.exists(log_filename):
+        return registry
+
+    records = []
+    try:
+        with open(log_filename, mode='r', encoding='utf-8') as f:
+            for line_idx, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    print(f"[Warning] Повреждена запись журнала {line_idx}, пропущена.")
+    except IOError as e:
+        raise DataSourceError(f"Ошибка чтения журнала: {e}")
+
+    marks = [i for i, r in enumerate(records) if r.get("op") == "compact"]
+    if marks and has_base:
+        base = _fingerprint(base_filename)
+        covered = [i for i in marks if records[i].get("base") == base]
+        if covered:
+            records = records[covered[-1] + 1:]
+    for record in records:
+        op = record.get("op")
+        if op == "sort":
+            if record.get("key") not in SORT_KEYS:
+                raise DataSourceError(f"Неверный критерий сортировки в журнале: {record.get('key')!r}")
+            registry = StudentRegistry(sort_students(registry, record["key"]))
+        elif op != "compact":
+            _apply(registry, record)
+    return registry
+
+def _fingerprint(filename: str) -> str:
+    """SHA-256 содержимого файла."""
+    digest = hashlib.sha256()
+    try:
+        with open(filename, mode='rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except IOError as e:
+        raise DataSourceError(f"Ошибка чтения базового файла: {e}")
+    return digest.hexdigest()
+
+def _apply(registry: StudentRegistry, record: dict) -> None:
+    op = record.get("op")
+    if op == "add":
+        registry.add(Student(id=record["id"], name=record["name"], grades=record["grades"]))
+    elif op == "delete":
+        registry.remove(record["id"])
+    elif op == "update_grades":
+        student = registry.get(record["id"])
+        if student is None:
+            raise StudentNotFoundError(f"Студент с ID {record['id']} не найден.")
+        registry.set_grades(student, record["grades"])
+    else:
+        raise DataSourceError(f"Неизвестная операция в журнале: {op}")
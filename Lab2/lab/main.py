@@ -1,10 +1,15 @@
+import os
 import sys
 import argparse
-from typing import List
+from typing import List, Optional
 from lab.models import Student
 from lab.errors import AppError
 import lab.io_utils as io
 import lab.processing as proc
+import lab.snapshot as snap
+import lab.metrics as metrics
+from lab.journal import Journal, replay_journal
+from lab.batch import read_operations, run_batch
 
 def input_int(prompt: str) -> int:
     while True:
@@ -24,10 +29,66 @@ def input_grades() -> List[int]:
         print("Ошибка: оценки должны быть числами.")
         return []
 
+def new_registry(students: List[Student]) -> proc.StudentRegistry:
+    registry = proc.StudentRegistry(students)
+    registry.subscribe(proc.Leaderboard())
+    registry.subscribe(proc.GroupStats())
+    registry.subscribe(proc.SortIndex('name'))
+    registry.subscribe(proc.SortIndex('id'))
+    return registry
+
+def attach_journal(journal: Optional[Journal], students: proc.StudentRegistry,
+                   sorted_by: Optional[str] = None) -> None:
+    """
+    Подключает журнал к новому списку. Загруженный список сворачивается в
+    базовый файл, а сортировка (sorted_by) записывается в журнал одной записью.
+    """
+    if journal is None:
+        return
+    journal.attach(students)
+    if sorted_by is None:
+        journal.compact()
+    else:
+        journal.record_sort(sorted_by)
+
+def load_roster(fname: str) -> proc.StudentRegistry:
+    """Загружает CSV, бинарный снимок (*.snap) или набор CSV-шардов (каталог / glob)."""
+    if os.path.isdir(fname) or any(c in fname for c in "*?["):
+        return new_registry(io.load_students_from_shards(io.expand_shards(fname)))
+    if fname.endswith(".snap"):
+        with snap.open_snapshot(fname) as roster:
+            return new_registry(roster)
+    return new_registry(io.load_students_from_csv(fname))
+
+def save_roster(fname: str, students: proc.StudentRegistry) -> None:
+    if fname.endswith(".snap"):
+        snap.save_students_to_snapshot(fname, students)
+    else:
+        io.save_students_to_csv(fname, students)
+
+def run_batch_mode(args, students: proc.StudentRegistry, journal: Optional[Journal]) -> int:
+    """Выполняет файл операций --batch без меню; возвращает код выхода."""
+    def make_registry(sorted_students: List[Student], key: str) -> proc.StudentRegistry:
+        registry = new_registry(sorted_students)
+        attach_journal(journal, registry, sorted_by=key)
+        return registry
+
+    out = open(args.output, mode='w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        students, failed = run_batch(students, read_operations(args.batch), out, make_registry)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.save:
+        save_roster(args.save, students)
+    if journal is not None:
+        journal.close()
+    return 1 if failed else 0
+
 def print_menu():
     print("\n=== Меню Управления Студентами ===")
-    print("1. Загрузить из CSV")
-    print("2. Сохранить в CSV")
+    print("1. Загрузить из CSV / снимка")
+    print("2. Сохранить в CSV / снимок")
     print("3. Показать всех студентов")
     print("4. Добавить студента")
     print("5. Удалить студента по ID")
@@ -35,21 +96,62 @@ def print_menu():
     print("7. Показать статистику группы")
     print("8. Экспорт ТОП-N студентов")
     print("9. Сортировка списка")
+    print("10. Метрики производительности")
+    print("11. Поиск (диапазон среднего балла / начало имени)")
     print("0. Выход")
 
 def main():
-    students: List[Student] = []
+    students = new_registry([])
     
     parser = argparse.ArgumentParser(description="Student Manager CLI")
-    parser.add_argument("--load", help="Путь к файлу для автозагрузки")
+    parser.add_argument("--load", help="Путь к файлу для автозагрузки (CSV, *.snap, каталог или glob с CSV-шардами)")
+    parser.add_argument("--journal", help="Базовый CSV журналируемого хранилища (изменения дописываются в <файл>.log)")
+    parser.add_argument("--batch", help="Выполнить операции из файла JSONL / CSV (\"-\" - stdin) без меню")
+    parser.add_argument("--output", help="Файл для результатов --batch (по умолчанию stdout)")
+    parser.add_argument("--save", help="Сохранить список после --batch (CSV или *.snap)")
+    parser.add_argument("--metrics", action="store_true", help="Собирать метрики вызовов (пункт меню 10)")
+    parser.add_argument("--profile", nargs="?", const="", metavar="FILE",
+                        help="Профилировать cProfile и tracemalloc (отчёт при выходе, FILE - сохранить .prof)")
     args = parser.parse_args()
 
+    profiler = None
+    if args.metrics or args.profile is not None:
+        metrics.enable()
+    if args.profile is not None:
+        profiler = metrics.Profiler(args.profile or None)
+        profiler.start()
+
+    journal = None
+    if args.journal:
+        try:
+            students = new_registry(replay_journal(args.journal))
+            journal = Journal(args.journal)
+            journal.attach(students)
+            if not args.batch:
+                print(f"Восстановлено {len(students)} студентов из журнала {args.journal}")
+        except AppError as e:
+            print(f"Ошибка при чтении журнала: {e}", file=sys.stderr if args.batch else sys.stdout)
+
     if args.load:
         try:
-            students = io.load_students_from_csv(args.load)
-            print(f"Загружено {len(students)} студентов из {args.load}")
+            students = load_roster(args.load)
+            attach_journal(journal, students)
+            if not args.batch:
+                print(f"Загружено {len(students)} студентов из {args.load}")
         except AppError as e:
-            print(f"Ошибка при загрузке: {e}")
+            print(f"Ошибка при загрузке: {e}", file=sys.stderr if args.batch else sys.stdout)
+            if args.batch:
+                sys.exit(2)
+
+    if args.batch:
+        try:
+            code = run_batch_mode(args, students, journal)
+        except AppError as e:
+            print(f"Ошибка пакетного режима: {e}", file=sys.stderr)
+            code = 2
+        if profiler is not None:
+            print(profiler.stop(), file=sys.stderr)
+        sys.exit(code)
 
     while True:
         print_menu()
@@ -58,13 +160,20 @@ def main():
         try:
             if choice == '1':
                 fname = input("Введите имя файла (data/students.csv): ") or "data/students.csv"
-                students = io.load_students_from_csv(fname)
+                students = load_roster(fname)
+                attach_journal(journal, students)
                 print(f"Успешно загружено {len(students)} записей.")
 
             elif choice == '2':
-                fname = input("Введите имя файла для сохранения: ")
-                io.save_students_to_csv(fname, students)
-                print("Сохранено.")
+                if journal is not None:
+                    fname = input("Введите имя файла для сохранения (Enter - только журнал): ")
+                else:
+                    fname = input("Введите имя файла для сохранения: ")
+                if journal is not None and not fname:
+                    print(f"Изменения уже записаны в журнал {journal.log_filename}.")
+                else:
+                    save_roster(fname, students)
+                    print("Сохранено.")
 
             elif choice == '3':
                 if not students:
@@ -110,10 +219,32 @@ def main():
                 if key not in ['avg', 'name', 'id']:
                     print("Неверный критерий.")
                 else:
-                    students = proc.sort_students(students, key)
+                    students = new_registry(proc.sort_students(students, key))
+                    attach_journal(journal, students, sorted_by=key)
                     print("Список отсортирован.")
 
+            elif choice == '10':
+                print(metrics.METRICS.report())
+
+            elif choice == '11':
+                query = input("Диапазон среднего (например, 60-80) или начало имени: ").strip()
+                lo, sep, hi = query.partition("-")
+                try:
+                    found = proc.students_in_avg_range(students, float(lo), float(hi)) if sep else None
+                except ValueError:
+                    found = None
+                if found is None:
+                    found = proc.students_by_name_prefix(students, query)
+                if not found:
+                    print("Ничего не найдено.")
+                for s in found:
+                    print(s)
+
             elif choice == '0':
+                if journal is not None:
+                    journal.close()
+                if profiler is not None:
+                    print(profiler.stop())
                 print("Выход...")
                 break
             else:
@@ -0,0 +1,155 @@
+"""
+Инструментирование горячих путей: число вызовов, задержки и разобранные строки.
+
+По умолчанию выключено: обёртка timed тогда стоит одной проверки флага
+на вызов функции (не на строку файла). Включается enable() - в CLI
+флагами --metrics и --profile. Метрики собираются в текущем процессе,
+воркеры параллельной загрузки шардов в них не попадают.
+"""
+import math
+import time
+from collections import deque
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Сколько последних замеров хранить для перцентилей
+MAX_SAMPLES = 10000
+
+class Timer:
+    """Число вызовов, суммарное время и последние MAX_SAMPLES задержек."""
+
+    __slots__ = ("count", "errors", "total", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=MAX_SAMPLES)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        """Перцентиль задержки (метод ближайшего ранга), в секундах."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(math.ceil(p / 100 * len(ordered)) - 1, 0)
+        return ordered[min(rank, len(ordered) - 1)]
+
+class Metrics:
+    """Реестр таймеров и счётчиков строк."""
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self) -> None:
+        self.timers: Dict[str, Timer] = {}
+        self.rows_parsed = 0
+        self.rows_rejected = 0
+        self.parse_seconds = 0.0
+
+    def timer(self, name: str) -> Timer:
+        t = self.timers.get(name)
+        if t is None:
+            t = self.timers[name] = Timer()
+        return t
+
+    def add_rows(self, parsed: int, rejected: int, seconds: float) -> None:
+        """Учитывает результат разбора одного файла."""
+        self.rows_parsed += parsed
+        self.rows_rejected += rejected
+        self.parse_seconds += seconds
+
+    def rows_per_second(self) -> float:
+        return self.rows_parsed / self.parse_seconds if self.parse_seconds else 0.0
+
+    def report(self) -> str:
+        """Текстовая сводка для меню CLI."""
+        if not self.timers and not self.rows_parsed and not self.rows_rejected:
+            return "Метрик пока нет." if self.enabled else \
+                "Метрики выключены (запустите с --metrics или --profile)."
+
+        lines = [f"{'Функция':<36}{'вызовы':>8}{'ошибки':>8}{'p50, мс':>10}{'p95, мс':>10}"
+                 f"{'p99, мс':>10}{'всего, мс':>12}"]
+        for name in sorted(self.timers):
+            t = self.timers[name]
+            lines.append(f"{name:<36}{t.count:>8}{t.errors:>8}{t.percentile(50) * 1e3:>10.3f}"
+                         f"{t.percentile(95) * 1e3:>10.3f}{t.percentile(99) * 1e3:>10.3f}"
+                         f"{t.total * 1e3:>12.1f}")
+        lines.append(f"Строк разобрано: {self.rows_parsed} "
+                     f"({self.rows_per_second():.0f} строк/с), отклонено: {self.rows_rejected}")
+        return "\n".join(lines)
+
+METRICS = Metrics()
+
+def enable(flag: bool = True) -> None:
+    METRICS.enabled = flag
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Декоратор: считает вызовы, ошибки и задержку функции под именем name
+    (по умолчанию <модуль>.<функция>), пока метрики включены.
+    """
+    def decorator(func: F) -> F:
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            timer = METRICS.timer(label)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                timer.errors += 1
+                raise
+            finally:
+                timer.add(time.perf_counter() - start)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+class Profiler:
+    """
+    Режим --profile: cProfile по всем вызовам и tracemalloc по памяти.
+    Заметно замедляет работу, поэтому включается только явно.
+    """
+
+    def __init__(self, output: Optional[str] = None, limit: int = 20):
+        self.output = output
+        self.limit = limit
+        self._profile = None
+
+    def start(self) -> None:
+        import cProfile
+        import tracemalloc
+        tracemalloc.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self) -> str:
+        """Останавливает профилирование и возвращает отчёт (и пишет .prof при output)."""
+        import io
+        import pstats
+        import tracemalloc
+
+        self._profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        out = io.StringIO()
+        if self.output:
+            self._profile.dump_stats(self.output)
+            out.write(f"Профиль сохранён в {self.output}\n")
+        pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(self.limit)
+        out.write(f"Память: сейчас {current / 2**20:.2f} МБ, пик {peak / 2**20:.2f} МБ\n")
+        for stat in snapshot.statistics("lineno")[:10]:
+            out.write(f"  {stat}\n")
+        return out.getvalue()
@@ -1,36 +1,142 @@
+from array import array
 from dataclasses import dataclass, field
-from typing import List
+from typing import Iterable, Tuple
 from lab.errors import ValidationError
 
+def _validate_fields(s_id: int, name: str, grades: Iterable[int]):
+    if not name or not name.strip():
+        raise ValidationError("Имя студента не может быть пустым.")
+    if s_id < 0:
+        raise ValidationError(f"ID должен быть положительным числом (получено: {s_id}).")
+    for g in grades:
+        if not (0 <= g <= 100):
+            raise ValidationError(f"Оценка должна быть от 0 до 100 (получено: {g}).")
+
+# Ключи индексов реестра: после создания студента не меняются
+# (переименование оставило бы индекс по имени в неверном порядке)
+_KEY_FIELDS = ('id', 'name')
+
+def _key_field_error(key: str) -> AttributeError:
+    return AttributeError(f"Поле {key} нельзя изменить после создания студента.")
+
 @dataclass
 class Student:
     """
     Класс, представляющий студента.
+    Оценки хранятся кортежем: изменить их можно только присваиванием
+    нового списка, после которого пересчитывается средний балл.
+    id и name после создания только для чтения.
     """
     id: int
     name: str
-    grades: List[int] = field(default_factory=list)
+    grades: Tuple[int, ...] = field(default_factory=tuple)
 
     def __post_init__(self):
         self.validate()
 
+    def __setattr__(self, key, value):
+        if key in _KEY_FIELDS and key in self.__dict__:
+            raise _key_field_error(key)
+        if key == 'grades':
+            value = tuple(value)
+        object.__setattr__(self, key, value)
+        if key == 'grades':
+            object.__setattr__(self, '_grades_sum', sum(value))
+            object.__setattr__(self, '_grades_count', len(value))
+            object.__setattr__(self, '_average', None)
+
+    @property
+    def grades_sum(self) -> int:
+        return self._grades_sum
+
+    @property
+    def grades_count(self) -> int:
+        return self._grades_count
+
     @property
     def average(self) -> float:
-        """Расчет среднего балла. Если оценок нет, возвращает 0.0."""
-        if not self.grades:
-            return 0.0
-        return sum(self.grades) / len(self.grades)
+        """Средний балл (кешируется до следующего изменения оценок). Если оценок нет, возвращает 0.0."""
+        if self._average is None:
+            avg = self._grades_sum / self._grades_count if self._grades_count else 0.0
+            object.__setattr__(self, '_average', avg)
+        return self._average
 
     def validate(self):
         """Проверка корректности данных студента."""
-        if not self.name or not self.name.strip():
-            raise ValidationError("Имя студента не может быть пустым.")
-        if self.id < 0:
-            raise ValidationError(f"ID должен быть положительным числом (получено: {self.id}).")
-        for g in self.grades:
-            if not (0 <= g <= 100):
-                raise ValidationError(f"Оценка должна быть от 0 до 100 (получено: {g}).")
+        _validate_fields(self.id, self.name, self.grades)
+
+    def __str__(self):
+        return (f"ID: {self.id} | {self.name:<20} | "
+                f"Ср. балл: {self.average:.2f} | Оценки: {list(self.grades)}")
+
+class CompactStudent:
+    """
+    Компактный вариант Student для больших списков: без __dict__,
+    оценки хранятся в array('B') по одному байту на оценку.
+    Интерфейс (validate, average, grades, __str__) совпадает со Student,
+    id и name так же только для чтения.
+    """
+    __slots__ = ('id', 'name', '_grades', '_grades_sum', '_average')
+
+    def __init__(self, id: int, name: str, grades: Iterable[int] = ()):
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, 'name', name)
+        grades = list(grades)
+        # Проверяем до упаковки: array('B') не примет значения вне 0..255
+        _validate_fields(id, name, grades)
+        self.grades = grades
+
+    def __setattr__(self, key, value):
+        if key in _KEY_FIELDS:
+            raise _key_field_error(key)
+        object.__setattr__(self, key, value)
+
+    def __reduce__(self):
+        # По умолчанию pickle восстанавливает слоты через setattr, а id и name он запрещает
+        return CompactStudent, (self.id, self.name, self._grades)
+
+    @property
+    def grades(self) -> Tuple[int, ...]:
+        return tuple(self._grades)
+
+    @grades.setter
+    def grades(self, value: Iterable[int]):
+        # Мимо __setattr__: на миллионах студентов его вызов заметно дороже
+        grades = array('B', value)
+        object.__setattr__(self, '_grades', grades)
+        object.__setattr__(self, '_grades_sum', sum(grades))
+        object.__setattr__(self, '_average', None)
+
+    @property
+    def grades_sum(self) -> int:
+        return self._grades_sum
+
+    @property
+    def grades_count(self) -> int:
+        return len(self._grades)
+
+    @property
+    def average(self) -> float:
+        """Средний балл (кешируется до следующего изменения оценок). Если оценок нет, возвращает 0.0."""
+        if self._average is None:
+            n = len(self._grades)
+            self._average = self._grades_sum / n if n else 0.0
+        return self._average
+
+    def validate(self):
+        """Проверка корректности данных студента."""
+        _validate_fields(self.id, self.name, self._grades)
+
+    def __eq__(self, other):
+        if not isinstance(other, (CompactStudent, Student)):
+            return NotImplemented
+        return (self.id, self.name, self.grades) == (other.id, other.name, other.grades)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CompactStudent(id={self.id!r}, name={self.name!r}, grades={self.grades!r})"
 
     def __str__(self):
         return (f"ID: {self.id} | {self.name:<20} | "
-                f"Ср. балл: {self.average:.2f} | Оценки: {self.grades}")
\ No newline at end of file
+                f"Ср. балл: {self.average:.2f} | Оценки: {self._grades.tolist()}")
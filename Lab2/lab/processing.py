@@ -1,66 +1,492 @@
-from typing import List, Tuple, Dict, Any, Optional
+import heapq
+from contextlib import contextmanager
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Callable, List, Tuple, Dict, Any, Optional, Iterable, Iterator, Union, Type, TypeVar
 from lab.models import Student
 from lab.errors import DuplicateIdError, StudentNotFoundError, ValidationError
+from lab.metrics import timed
 
-def get_student_by_id(students: List[Student], s_id: int) -> Optional[Student]:
+try:
+    from lab.columnar import GradeStore
+except ImportError:  # numpy не установлен
+    GradeStore = None
+
+L = TypeVar("L")
+
+class StudentRegistry:
+    """
+    Контейнер студентов с хеш-индексом по id.
+    Поиск, добавление и удаление за O(1), порядок вставки сохраняется.
+    Подписчики (subscribe) получают уведомления on_add / on_remove / on_update
+    и могут поддерживать свои индексы без пересчёта по всему списку.
+    Подписчик с методом rebuild(students) умеет перестраиваться целиком:
+    это используется при подключении и в групповых изменениях (bulk).
+    Подписчик с методами begin_bulk / end_bulk в групповом изменении
+    получает уведомления как обычно, но приводит индекс в порядок один раз
+    в end_bulk.
+    """
+
+    def __init__(self, students: Iterable[Student] = ()):
+        self._index: Dict[int, Student] = {}
+        self._listeners: List[Any] = []
+        self._batched: List[Any] = []
+        self._in_bulk = False
+        for s in students:
+            self.add(s)
+
+    def subscribe(self, listener: Any, replay: bool = True) -> None:
+        """Подключает подписчика; при replay передаёт ему уже имеющихся студентов."""
+        self._listeners.append(listener)
+        if replay:
+            if hasattr(listener, "rebuild"):
+                listener.rebuild(self)
+            else:
+                for s in self._index.values():
+                    listener.on_add(s)
+
+    @contextmanager
+    def bulk(self) -> Iterator["StudentRegistry"]:
+        """
+        Групповое изменение. Подписчики с begin_bulk / end_bulk сливают
+        изменения в свой индекс один раз в конце; подписчики только с rebuild
+        не получают уведомлений и перестраиваются в конце целиком. Остальные
+        подписчики (например, журнал) уведомляются как обычно. Внутри группы
+        индексы подписчиков недоступны через listener / listeners.
+        """
+        if self._in_bulk:
+            yield self
+            return
+        listeners = self._listeners
+        self._batched = [l for l in listeners if hasattr(l, "end_bulk")]
+        deferred = [l for l in listeners if hasattr(l, "rebuild") and not hasattr(l, "end_bulk")]
+        self._listeners = [l for l in listeners if not any(l is d for d in deferred)]
+        self._in_bulk = True
+        for l in self._batched:
+            l.begin_bulk()
+        try:
+            yield self
+        finally:
+            self._listeners = listeners
+            self._in_bulk = False
+            batched, self._batched = self._batched, []
+            for l in batched:
+                l.end_bulk()
+            for l in deferred:
+                l.rebuild(self)
+
+    def _available(self, l: Any) -> bool:
+        return not any(l is b for b in self._batched)
+
+    def listener(self, kind: Type[L]) -> Optional[L]:
+        """Первый подписчик указанного типа или None."""
+        for l in self._listeners:
+            if isinstance(l, kind) and self._available(l):
+                return l
+        return None
+
+    def listeners(self, kind: Type[L]) -> List[L]:
+        """Все подписчики указанного типа."""
+        return [l for l in self._listeners if isinstance(l, kind) and self._available(l)]
+
+    def add(self, student: Student) -> None:
+        if student.id in self._index:
+            raise DuplicateIdError(f"Студент с ID {student.id} уже существует.")
+        self._index[student.id] = student
+        for l in self._listeners:
+            l.on_add(student)
+
+    def get(self, s_id: int) -> Optional[Student]:
+        return self._index.get(s_id)
+
+    def remove(self, s_id: int) -> Student:
+        try:
+            student = self._index.pop(s_id)
+        except KeyError:
+            raise StudentNotFoundError(f"Студент с ID {s_id} не найден.")
+        for l in self._listeners:
+            l.on_remove(student)
+        return student
+
+    def set_grades(self, student: Student, grades: List[int]) -> None:
+        old_grades = student.grades
+        student.grades = grades
+        for l in self._listeners:
+            l.on_update(student, old_grades)
+
+    def __contains__(self, s_id: int) -> bool:
+        return s_id in self._index
+
+    def __iter__(self) -> Iterator[Student]:
+        return iter(self._index.values())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+Students = Union[List[Student], StudentRegistry]
+
+def _avg_key(s: Student) -> Tuple[float, str]:
+    return (-s.average, s.name)
+
+# Ключи сортировки sort_students; при равенстве ключей порядок исходный
+SORT_KEYS: Dict[str, Callable[[Student], tuple]] = {
+    'avg': _avg_key,
+    'name': lambda s: (s.name,),
+    'id': lambda s: (s.id,),
+}
+
+# Во сколько раз индекс должен быть больше числа изменений группы, чтобы
+# изменения выгоднее было применить по одному, а не слиянием за O(n)
+# (замерено на 1e5 студентов).
+MERGE_RATIO = 25
+
+def _merge_keys(keys: List[tuple], added: List[tuple], removed: List[tuple],
+                entries: Dict[int, tuple]) -> List[tuple]:
+    """
+    Отсортированные ключи индекса после группового изменения. Ключ
+    актуален, только если entries[id] - тот же объект (id - последний
+    элемент ключа). Немногие изменения применяются по одному; иначе два
+    отсортированных отрезка - старые и добавленные ключи - сливаются одной
+    сортировкой: timsort сливает их за O(n).
+    """
+    if (len(added) + len(removed)) * MERGE_RATIO < len(keys):
+        for e in removed:
+            i = bisect_left(keys, e)
+            if i < len(keys) and keys[i] is e:
+                del keys[i]
+        for e in added:
+            if entries.get(e[-1]) is e:
+                insort(keys, e)
+        return keys
+    merged = [e for e in keys if entries.get(e[-1]) is e]
+    merged.extend(sorted(e for e in added if entries.get(e[-1]) is e))
+    merged.sort()
+    return merged
+
+class SortIndex:
+    """
+    Отсортированный индекс студентов по одному из ключей SORT_KEYS,
+    обновляемый инкрементально. Подключается к StudentRegistry через
+    subscribe; изменение стоит бинарного поиска и одной вставки/удаления
+    в списке ключей, а в групповом изменении (bulk) - O(1) с одним слиянием
+    в конце. Упорядоченный обход, диапазоны и страницы отдаются без
+    сортировки всего списка.
+    """
+
+    def __init__(self, key_type: str):
+        self.key_type = key_type
+        self._key = SORT_KEYS[key_type]
+        # (ключ..., порядковый номер, id): номер сохраняет порядок вставки
+        # при равных ключах, как у устойчивой сортировки
+        self._keys: List[tuple] = []
+        self._entries: Dict[int, tuple] = {}
+        self._students: Dict[int, Student] = {}
+        self._seq = 0
+        # Ключи, добавленные и удалённые в групповом изменении (None - вне его)
+        self._added: Optional[List[tuple]] = None
+        self._removed: List[tuple] = []
+
+    def _entry(self, student: Student, seq: int) -> tuple:
+        return (*self._key(student), seq, student.id)
+
+    def _insert(self, student: Student, seq: int) -> None:
+        entry = self._entry(student, seq)
+        if self._added is None:
+            insort(self._keys, entry)
+        else:
+            self._added.append(entry)
+        self._entries[student.id] = entry
+        self._students[student.id] = student
+
+    def _discard(self, s_id: int) -> int:
+        entry = self._entries.pop(s_id)
+        if self._added is None:
+            del self._keys[bisect_left(self._keys, entry)]
+        else:
+            self._removed.append(entry)
+        del self._students[s_id]
+        return entry[-2]
+
+    def begin_bulk(self) -> None:
+        self._added = []
+
+    def end_bulk(self) -> None:
+        self._keys = _merge_keys(self._keys, self._added, self._removed, self._entries)
+        self._added, self._removed = None, []
+
+    def rebuild(self, students: Iterable[Student]) -> None:
+        """Строит индекс заново одной сортировкой: O(n log n) вместо n вставок."""
+        self._students = {s.id: s for s in students}
+        self._keys = sorted(self._entry(s, seq) for seq, s in enumerate(self._students.values()))
+        self._entries = {entry[-1]: entry for entry in self._keys}
+        self._seq = len(self._keys)
+
+    def on_add(self, student: Student) -> None:
+        self._insert(student, self._seq)
+        self._seq += 1
+
+    def on_remove(self, student: Student) -> None:
+        self._discard(student.id)
+
+    def on_update(self, student: Student, old_grades: List[int]) -> None:
+        old = self._entries[student.id]
+        if self._entry(student, old[-2]) != old:  # индексы по id и имени оценки не меняют
+            self._insert(student, self._discard(student.id))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Student]:
+        return (self._students[entry[-1]] for entry in self._keys)
+
+    def slice(self, start: int, stop: Optional[int] = None) -> List[Student]:
+        """Студенты с позиций start..stop-1 в порядке индекса (страница)."""
+        return [self._students[entry[-1]] for entry in self._keys[start:stop]]
+
+    def range(self, lo: Any, hi: Any) -> List[Student]:
+        """Студенты, у которых первый элемент ключа в [lo, hi]."""
+        first = itemgetter(0)
+        start = bisect_left(self._keys, lo, key=first)
+        stop = bisect_right(self._keys, hi, key=first)
+        return self.slice(start, stop)
+
+    def prefix(self, text: str) -> List[Student]:
+        """Студенты, у которых первый элемент ключа (строка) начинается с text."""
+        result = []
+        for i in range(bisect_left(self._keys, text, key=itemgetter(0)), len(self._keys)):
+            entry = self._keys[i]
+            if not entry[0].startswith(text):
+                break
+            result.append(self._students[entry[-1]])
+        return result
+
+class Leaderboard(SortIndex):
+    """
+    Рейтинг студентов по (-средний балл, имя): SortIndex по ключу 'avg'.
+    """
+
+    def __init__(self):
+        super().__init__('avg')
+
+    def top(self, n: int) -> List[Student]:
+        if n <= 0:
+            return []
+        return self.slice(0, n)
+
+class GroupStats:
+    """
+    Агрегаты группы, поддерживаемые инкрементально: число студентов,
+    сумма и количество всех оценок, лучший и худший по среднему баллу.
+    Подключается к StudentRegistry через subscribe, stats() работает за O(1).
+    """
+
+    def __init__(self):
+        self.total_sum = 0
+        self.total_count = 0
+        # (средний балл, порядковый номер, id): первый элемент - худший,
+        # последний - лучший, как при устойчивой сортировке по возрастанию
+        self._keys: List[Tuple[float, int, int]] = []
+        self._entries: Dict[int, Tuple[float, int, int]] = {}
+        self._students: Dict[int, Student] = {}
+        self._seq = 0
+        self._added: Optional[List[Tuple[float, int, int]]] = None
+        self._removed: List[Tuple[float, int, int]] = []
+
+    def _insert(self, student: Student, seq: int) -> None:
+        entry = (student.average, seq, student.id)
+        if self._added is None:
+            insort(self._keys, entry)
+        else:
+            self._added.append(entry)
+        self._entries[student.id] = entry
+        self._students[student.id] = student
+        self.total_sum += student.grades_sum
+        self.total_count += student.grades_count
+
+    def _discard(self, student: Student, grades_sum: int, grades_count: int) -> int:
+        entry = self._entries.pop(student.id)
+        if self._added is None:
+            del self._keys[bisect_left(self._keys, entry)]
+        else:
+            self._removed.append(entry)
+        del self._students[student.id]
+        self.total_sum -= grades_sum
+        self.total_count -= grades_count
+        return entry[1]
+
+    def begin_bulk(self) -> None:
+        self._added = []
+
+    def end_bulk(self) -> None:
+        self._keys = _merge_keys(self._keys, self._added, self._removed, self._entries)
+        self._added, self._removed = None, []
+
+    def rebuild(self, students: Iterable[Student]) -> None:
+        """Пересчитывает агрегаты заново за один проход и одну сортировку."""
+        self._students = {s.id: s for s in students}
+        self._keys = sorted((s.average, seq, s.id) for seq, s in enumerate(self._students.values()))
+        self._entries = {entry[2]: entry for entry in self._keys}
+        self._seq = len(self._keys)
+        self.total_sum = sum(s.grades_sum for s in self._students.values())
+        self.total_count = sum(s.grades_count for s in self._students.values())
+
+    def on_add(self, student: Student) -> None:
+        self._insert(student, self._seq)
+        self._seq += 1
+
+    def on_remove(self, student: Student) -> None:
+        self._discard(student, student.grades_sum, student.grades_count)
+
+    def on_update(self, student: Student, old_grades: List[int]) -> None:
+        seq = self._discard(student, sum(old_grades), len(old_grades))
+        self._insert(student, seq)
+
+    def stats(self) -> Dict[str, Any]:
+        if not self._keys:
+            return {"count": 0, "overall_avg": 0.0, "best": None, "worst": None}
+        return {
+            "count": len(self._keys),
+            "overall_avg": self.total_sum / self.total_count if self.total_count else 0.0,
+            "best": self._students[self._keys[-1][2]],
+            "worst": self._students[self._keys[0][2]]
+        }
+
+@timed()
+def get_student_by_id(students: Students, s_id: int) -> Optional[Student]:
+    if isinstance(students, StudentRegistry):
+        return students.get(s_id)
     for s in students:
         if s.id == s_id:
             return s
     return None
 
-def add_student(students: List[Student], s_id: int, name: str) -> None:
+@timed()
+def add_student(students: Students, s_id: int, name: str) -> None:
     if get_student_by_id(students, s_id):
         raise DuplicateIdError(f"Студент с ID {s_id} уже существует.")
     
     new_student = Student(id=s_id, name=name, grades=[])
-    students.append(new_student)
+    if isinstance(students, StudentRegistry):
+        students.add(new_student)
+    else:
+        students.append(new_student)
 
-def delete_student(students: List[Student], s_id: int) -> None:
+@timed()
+def delete_student(students: Students, s_id: int) -> None:
+    if isinstance(students, StudentRegistry):
+        students.remove(s_id)
+        return
     s = get_student_by_id(students, s_id)
     if not s:
         raise StudentNotFoundError(f"Студент с ID {s_id} не найден.")
     students.remove(s)
 
-def update_grades(students: List[Student], s_id: int, new_grades: List[int]) -> None:
+@timed()
+def update_grades(students: Students, s_id: int, new_grades: List[int]) -> None:
     s = get_student_by_id(students, s_id)
     if not s:
         raise StudentNotFoundError(f"Студент с ID {s_id} не найден.")
     
     temp_s = Student(id=s_id, name=s.name, grades=new_grades) 
-    s.grades = new_grades
+    if isinstance(students, StudentRegistry):
+        students.set_grades(s, new_grades)
+    else:
+        s.grades = new_grades
 
-def calculate_stats(students: List[Student]) -> Dict[str, Any]:
-    if not students:
-        return {
-            "count": 0,
-            "overall_avg": 0.0,
-            "best": None,
-            "worst": None
-        }
+@timed()
+def calculate_stats(students: Iterable[Student]) -> Dict[str, Any]:
+    """
+    Статистика группы за один проход, поэтому принимает и поток студентов.
+    При равных средних лучший - последний, худший - первый по порядку.
+    """
+    if GradeStore is not None and isinstance(students, GradeStore):
+        return students.stats()
+    if isinstance(students, StudentRegistry):
+        group = students.listener(GroupStats)
+        if group is not None:
+            return group.stats()
 
-    all_grades = [g for s in students for g in s.grades]
-    overall_avg = sum(all_grades) / len(all_grades) if all_grades else 0.0
+    count = 0
+    grades_sum = 0
+    grades_count = 0
+    best = worst = None
+    best_avg = worst_avg = 0.0
+
+    for s in students:
+        count += 1
+        grades_sum += s.grades_sum
+        grades_count += s.grades_count
+        avg = s.average
+        if best is None or avg >= best_avg:
+            best, best_avg = s, avg
+        if worst is None or avg < worst_avg:
+            worst, worst_avg = s, avg
 
-    sorted_by_avg = sorted(students, key=lambda s: s.average)
-    
     return {
-        "count": len(students),
-        "overall_avg": overall_avg,
-        "best": sorted_by_avg[-1],
-        "worst": sorted_by_avg[0]
+        "count": count,
+        "overall_avg": grades_sum / grades_count if grades_count else 0.0,
+        "best": best,
+        "worst": worst
     }
 
-def sort_students(students: List[Student], key_type: str) -> List[Student]:
+def sort_index(students: Iterable[Student], key_type: str) -> Optional[SortIndex]:
+    """Подключённый к реестру SortIndex по ключу key_type или None."""
+    if isinstance(students, StudentRegistry):
+        for index in students.listeners(SortIndex):
+            if index.key_type == key_type:
+                return index
+    return None
 
-    if key_type == 'avg':
-        return sorted(students, key=lambda s: (-s.average, s.name))
-    elif key_type == 'name':
-        return sorted(students, key=lambda s: s.name)
-    elif key_type == 'id':
-        return sorted(students, key=lambda s: s.id)
-    else:
+@timed()
+def sort_students(students: Iterable[Student], key_type: str) -> List[Student]:
+    """
+    Сортировка по 'avg', 'name' или 'id'. Если у реестра есть SortIndex
+    с этим ключом, готовый порядок берётся из него за O(n).
+    """
+    if key_type not in SORT_KEYS:
         return students
+    index = sort_index(students, key_type)
+    if index is not None:
+        return list(index)
+    return sorted(students, key=SORT_KEYS[key_type])
+
+@timed()
+def students_in_avg_range(students: Iterable[Student], lo: float, hi: float) -> List[Student]:
+    """Студенты со средним баллом в [lo, hi], от большего среднего к меньшему."""
+    index = sort_index(students, 'avg')
+    if index is not None:
+        return index.range(-hi, -lo)
+    return sorted((s for s in students if lo <= s.average <= hi), key=_avg_key)
+
+@timed()
+def students_by_name_prefix(students: Iterable[Student], prefix: str) -> List[Student]:
+    """Студенты, чьё имя начинается с prefix, по алфавиту."""
+    index = sort_index(students, 'name')
+    if index is not None:
+        return index.prefix(prefix)
+    return sorted((s for s in students if s.name.startswith(prefix)), key=SORT_KEYS['name'])
+
+@timed()
+def page_students(students: Iterable[Student], key_type: str, offset: int, limit: int) -> List[Student]:
+    """Страница отсортированного списка: limit студентов начиная с позиции offset."""
+    if key_type not in SORT_KEYS:
+        raise ValidationError(f"Неверный критерий сортировки: {key_type!r}")
+    if offset < 0 or limit <= 0:
+        return []
+    index = sort_index(students, key_type)
+    if index is not None:
+        return index.slice(offset, offset + limit)
+    return heapq.nsmallest(offset + limit, students, key=SORT_KEYS[key_type])[offset:]
 
-def get_top_n(students: List[Student], n: int) -> List[Student]:
-    sorted_s = sort_students(students, 'avg')
-    return sorted_s[:n]
\ No newline at end of file
+@timed()
+def get_top_n(students: Iterable[Student], n: int) -> List[Student]:
+    """
+    ТОП-N по среднему баллу (при равенстве - по имени).
+    Если у реестра есть Leaderboard, ответ берётся из него, иначе
+    используется ограниченная куча: O(n log N) и подходит для потока.
+    """
+    if isinstance(students, StudentRegistry):
+        board = students.listener(Leaderboard)
+        if board is not None:
+            return board.top(n)
+    return heapq.nsmallest(n, students, key=_avg_key)
@@ -0,0 +1,295 @@
+"""
+Локальный HTTP/JSON сервис поверх реестра студентов (asyncio, только stdlib).
+
+    GET /students/{id}         - студент по id
+    GET /students              - все студенты потоком NDJSON (chunked)
+    GET /top?n=10              - ТОП-N по среднему баллу
+    GET /stats                 - статистика группы
+    PUT /students/{id}/grades  - замена оценок, тело {"grades": [...]}
+
+Все обработчики работают в одном цикле событий. Чтения не делают await
+между обращениями к реестру, поэтому не пересекаются с изменениями и
+выполняются без блокировок; изменения сериализуются asyncio.Lock.
+Ответы /stats и /top кешируются до следующего изменения реестра (не больше
+CACHE_ENTRIES последних ответов; n в /top ограничивается размером списка).
+Состав списка /students фиксируется в момент запроса, так что медленный
+клиент не задерживает запись.
+
+Запуск: python -m lab.server --load data/students.csv [--port 8080]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from lab.models import Student
+from lab.errors import AppError, StudentNotFoundError
+import lab.processing as proc
+
+MAX_BODY = 1 << 20
+# Сколько студентов отправлять одним chunk-ом в /students
+STREAM_CHUNK = 1000
+# Сколько готовых ответов держать в кеше (вытесняются давно не запрошенные)
+CACHE_ENTRIES = 64
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+class ResponseCache:
+    """
+    Подписчик реестра с готовыми телами ответов, не больше max_entries.
+    Любое изменение реестра (on_add / on_remove / on_update) сбрасывает кеш.
+    """
+
+    def __init__(self, max_entries: int = CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._bodies: "OrderedDict[Any, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def get(self, key: Any) -> Optional[bytes]:
+        body = self._bodies.get(key)
+        if body is not None:
+            self._bodies.move_to_end(key)
+        return body
+
+    def put(self, key: Any, body: bytes) -> bytes:
+        self._bodies[key] = body
+        self._bodies.move_to_end(key)
+        if len(self._bodies) > self.max_entries:
+            self._bodies.popitem(last=False)
+        return body
+
+    def clear(self) -> None:
+        self._bodies.clear()
+
+    def on_add(self, student: Student) -> None:
+        self.clear()
+
+    def on_remove(self, student: Student) -> None:
+        self.clear()
+
+    def on_update(self, student: Student, old_grades) -> None:
+        self.clear()
+
+def _student_json(s: Optional[Student], grades: bool = True) -> Optional[Dict[str, Any]]:
+    if s is None:
+        return None
+    data = {"id": s.id, "name": s.name, "average": round(s.average, 2)}
+    if grades:
+        data["grades"] = s.grades
+    return data
+
+def _dumps(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+class RosterService:
+    """Обработчик соединений asyncio.start_server для одного реестра."""
+
+    def __init__(self, students: proc.StudentRegistry):
+        self.students = students
+        self.cache = ResponseCache()
+        students.subscribe(self.cache, replay=False)
+        self._write_lock = asyncio.Lock()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обслуживает соединение (HTTP/1.1 keep-alive) до закрытия клиентом."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    await self._send(writer, e.status, _dumps({"error": str(e)}), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    await self._dispatch(writer, method, target, body, keep_alive)
+                except HttpError as e:
+                    await self._send(writer, e.status, _dumps({"error": str(e)}), keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader
+                            ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, _version = line.decode('latin-1').split()
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Некорректная строка запроса.")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode('latin-1').partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Некорректный Content-Length.")
+        if length > MAX_BODY:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Слишком большое тело запроса.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _send(self, writer: asyncio.StreamWriter, status: HTTPStatus, body: bytes,
+                    keep_alive: bool = True) -> None:
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def _dispatch(self, writer: asyncio.StreamWriter, method: str, target: str,
+                        body: bytes, keep_alive: bool) -> None:
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        query = parse_qs(url.query)
+
+        if method == "GET" and parts == ["stats"]:
+            await self._send(writer, HTTPStatus.OK, self.stats(), keep_alive)
+        elif method == "GET" and parts == ["top"]:
+            n = _int(query.get("n", ["10"])[0], "n")
+            await self._send(writer, HTTPStatus.OK, self.top(n), keep_alive)
+        elif method == "GET" and parts == ["students"]:
+            await self._stream_students(writer, keep_alive)
+        elif method == "GET" and len(parts) == 2 and parts[0] == "students":
+            await self._send(writer, HTTPStatus.OK, self.lookup(_int(parts[1], "id")), keep_alive)
+        elif method == "PUT" and len(parts) == 3 and parts[0] == "students" and parts[2] == "grades":
+            result = await self.update_grades(_int(parts[1], "id"), body)
+            await self._send(writer, HTTPStatus.OK, result, keep_alive)
+        else:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Нет обработчика для {method} {url.path}")
+
+    def lookup(self, s_id: int) -> bytes:
+        s = self.students.get(s_id)
+        if s is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Студент с ID {s_id} не найден.")
+        return _dumps(_student_json(s))
+
+    def stats(self) -> bytes:
+        body = self.cache.get("stats")
+        if body is None:
+            stats = proc.calculate_stats(self.students)
+            body = self.cache.put("stats", _dumps({
+                "count": stats["count"],
+                "overall_avg": round(stats["overall_avg"], 2),
+                "best": _student_json(stats["best"], grades=False),
+                "worst": _student_json(stats["worst"], grades=False),
+            }))
+        return body
+
+    def top(self, n: int) -> bytes:
+        n = max(0, min(n, len(self.students)))
+        body = self.cache.get(("top", n))
+        if body is None:
+            top_s = proc.get_top_n(self.students, n)
+            body = self.cache.put(("top", n), _dumps([_student_json(s) for s in top_s]))
+        return body
+
+    async def update_grades(self, s_id: int, body: bytes) -> bytes:
+        try:
+            grades = json.loads(body)["grades"]
+            if not isinstance(grades, list) or not all(type(g) is int for g in grades):  # bool - тоже int
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Ожидается тело {"grades": [целые числа]}.')
+
+        async with self._write_lock:
+            try:
+                proc.update_grades(self.students, s_id, grades)
+            except StudentNotFoundError as e:
+                raise HttpError(HTTPStatus.NOT_FOUND, str(e))
+            except AppError as e:
+                raise HttpError(HTTPStatus.BAD_REQUEST, str(e))
+        return _dumps(_student_json(self.students.get(s_id)))
+
+    async def _stream_students(self, writer: asyncio.StreamWriter, keep_alive: bool) -> None:
+        students = list(self.students)
+        head = ("HTTP/1.1 200 OK\r\n"
+                "Content-Type: application/x-ndjson; charset=utf-8\r\n"
+                "Transfer-Encoding: chunked\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1'))
+        for start in range(0, len(students), STREAM_CHUNK):
+            chunk = b"".join(_dumps(_student_json(s)) + b"\n"
+                             for s in students[start:start + STREAM_CHUNK])
+            writer.write(f"{len(chunk):x}\r\n".encode('latin-1') + chunk + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+def _int(value: str, field: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Параметр {field} должен быть целым числом.")
+
+async def serve(students: proc.StudentRegistry, host: str = "127.0.0.1",
+                port: int = 8080) -> asyncio.AbstractServer:
+    """Запускает сервис и возвращает сервер (port=0 - выбрать свободный порт)."""
+    service = RosterService(students)
+    return await asyncio.start_server(service.handle, host, port)
+
+def main():
+    from lab.main import load_roster, new_registry
+    from lab.journal import Journal, replay_journal
+
+    parser = argparse.ArgumentParser(description="HTTP/JSON сервис списка студентов")
+    parser.add_argument("--load", help="Файл списка (CSV, *.snap, каталог или glob с CSV-шардами)")
+    parser.add_argument("--journal", help="Базовый CSV журналируемого хранилища")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    journal = None
+    try:
+        if args.journal:
+            students = new_registry(replay_journal(args.journal))
+            journal = Journal(args.journal)
+            journal.attach(students)
+        elif args.load:
+            students = load_roster(args.load)
+        else:
+            students = new_registry([])
+    except AppError as e:
+        print(f"Ошибка при загрузке: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    async def run():
+        server = await serve(students, args.host, args.port)
+        addr = server.sockets[0].getsockname()
+        print(f"Сервис запущен на http://{addr[0]}:{addr[1]} ({len(students)} студентов)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if journal is not None:
+            journal.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Бинарный снимок списка студентов с загрузкой через mmap.
+
+Формат (little-endian):
+    заголовок       magic(8) | n(u64) | длина блока имён(u64) | число оценок(u64)
+    ids             i64 * n        - id в исходном порядке
+    order           i64 * n        - номера строк, отсортированные по id (для поиска)
+    name_offsets    u64 * (n + 1)  - смещения имён в блоке имён
+    grade_offsets   u64 * (n + 1)  - смещения оценок в блоке оценок
+    names           utf-8 байты всех имён подряд
+    grades          u8 на оценку
+
+Открытие файла ничего не декодирует: страницы подгружаются ОС по мере обращения,
+поиск по id - бинарный поиск по order без чтения всего файла.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, Optional
+from lab.models import Student
+from lab.errors import DataSourceError
+from lab.io_utils import iter_students_from_csv, save_students_to_csv
+
+MAGIC = b"LABSNAP1"
+_HEADER = struct.Struct("<8sQQQ")
+
+def _to_le(arr: array) -> array:
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr
+
+def save_students_to_snapshot(filename: str, students: Iterable[Student]):
+    """Сохраняет студентов в бинарный снимок."""
+    ids = array('q')
+    name_offsets = array('Q', [0])
+    grade_offsets = array('Q', [0])
+    names = bytearray()
+    grades = array('B')
+
+    for s in students:
+        ids.append(s.id)
+        names += s.name.encode('utf-8')
+        name_offsets.append(len(names))
+        grades.extend(s.grades)
+        grade_offsets.append(len(grades))
+
+    order = array('q', sorted(range(len(ids)), key=ids.__getitem__))
+
+    try:
+        with open(filename, mode='wb') as f:
+            f.write(_HEADER.pack(MAGIC, len(ids), len(names), len(grades)))
+            for arr in (ids, order, name_offsets, grade_offsets):
+                _to_le(arr).tofile(f)
+            f.write(names)
+            grades.tofile(f)
+    except IOError as e:
+        raise DataSourceError(f"Ошибка записи снимка: {e}")
+
+class MappedRoster:
+    """
+    Список студентов, отображённый из снимка в память только для чтения.
+    Студенты декодируются по одному при обращении.
+    """
+
+    def __init__(self, filename: str):
+        if sys.byteorder != 'little':
+            raise DataSourceError("Снимки поддерживаются только на little-endian платформах.")
+        if not os.path.exists(filename):
+            raise DataSourceError(f"Файл не найден: {filename}")
+
+        try:
+            with open(filename, mode='rb') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, ValueError) as e:
+            raise DataSourceError(f"Ошибка открытия снимка: {e}")
+
+        if len(self._mm) < _HEADER.size:
+            self._mm.close()
+            raise DataSourceError(f"Файл не является снимком: {filename}")
+        magic, n, names_len, grades_len = _HEADER.unpack_from(self._mm)
+        ints_end = _HEADER.size + 8 * (4 * n + 2)
+        if magic != MAGIC or len(self._mm) != ints_end + names_len + grades_len:
+            self._mm.close()
+            raise DataSourceError(f"Файл не является снимком: {filename}")
+
+        self._n = n
+        self._view = memoryview(self._mm)
+        pos = _HEADER.size
+        self._ids = self._view[pos:pos + 8 * n].cast('q')
+        pos += 8 * n
+        self._order = self._view[pos:pos + 8 * n].cast('q')
+        pos += 8 * n
+        self._name_offsets = self._view[pos:pos + 8 * (n + 1)].cast('Q')
+        pos += 8 * (n + 1)
+        self._grade_offsets = self._view[pos:pos + 8 * (n + 1)].cast('Q')
+        pos += 8 * (n + 1)
+        self._names = self._view[pos:pos + names_len]
+        self._grades = self._view[pos + names_len:]
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: int) -> Student:
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        names = self._names[self._name_offsets[i]:self._name_offsets[i + 1]]
+        grades = self._grades[self._grade_offsets[i]:self._grade_offsets[i + 1]]
+        return Student(id=self._ids[i], name=bytes(names).decode('utf-8'), grades=grades.tolist())
+
+    def __iter__(self) -> Iterator[Student]:
+        for i in range(self._n):
+            yield self[i]
+
+    def _find(self, s_id: int) -> int:
+        pos = bisect_left(range(self._n), s_id, key=lambda k: self._ids[self._order[k]])
+        if pos < self._n and self._ids[self._order[pos]] == s_id:
+            return self._order[pos]
+        return -1
+
+    def get(self, s_id: int) -> Optional[Student]:
+        """Поиск по id бинарным поиском по отображённому файлу."""
+        i = self._find(s_id)
+        return self[i] if i >= 0 else None
+
+    def __contains__(self, s_id: int) -> bool:
+        return self._find(s_id) >= 0
+
+    def close(self):
+        for view in (self._ids, self._order, self._name_offsets,
+                     self._grade_offsets, self._names, self._grades, self._view):
+            view.release()
+        self._mm.close()
+
+    def __enter__(self) -> "MappedRoster":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_snapshot(filename: str) -> MappedRoster:
+    return MappedRoster(filename)
+
+def csv_to_snapshot(csv_filename: str, snapshot_filename: str):
+    """Потоково конвертирует CSV в снимок."""
+    save_students_to_snapshot(snapshot_filename, iter_students_from_csv(csv_filename))
+
+def snapshot_to_csv(snapshot_filename: str, csv_filename: str):
+    with open_snapshot(snapshot_filename) as roster:
+        save_students_to_csv(csv_filename, roster)
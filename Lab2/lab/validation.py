@@ -0,0 +1,291 @@
+"""
+Проверка входных файлов с оценками: по частям в пуле процессов и без
+остановки на первой ошибке.
+
+Каждая строка проверяется сразу по всем правилам, нарушения собираются
+записями Violation(row, column, rule, value). Строки с нарушениями не
+попадают в результат и при необходимости пишутся в файл карантина
+в исходном виде; остальные строки возвращаются как студенты.
+Номера строк - как в предупреждениях загрузчиков: строки данных с 1,
+без заголовка.
+
+Запуск: python -m lab.validation data/students.csv [--quarantine bad.csv] [--violations v.csv]
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from lab.models import Student
+from lab.errors import DataSourceError, ValidationError
+from lab.io_utils import detect_header
+from lab.metrics import METRICS, timed
+
+# Правила (поле rule у Violation)
+MISSING_FIELDS = "missing_fields"
+NOT_INTEGER = "not_integer"
+NEGATIVE_ID = "negative_id"
+ID_RANGE = "id_range"
+EMPTY_NAME = "empty_name"
+GRADE_RANGE = "grade_range"
+DUPLICATE_ID = "duplicate_id"
+MODEL = "model"
+
+# Наибольший id: принятые id хранятся в array('q')
+MAX_ID = 2 ** 63 - 1
+
+Row = Tuple[int, List[str]]
+
+@dataclass(frozen=True)
+class Violation:
+    """Нарушение правила в одной ячейке входного файла."""
+    row: int
+    column: str
+    rule: str
+    value: str
+
+@dataclass
+class ValidationReport:
+    """Итог проверки: принятые студенты, все нарушения и число строк."""
+    accepted: List[Student] = field(default_factory=list)
+    violations: List[Violation] = field(default_factory=list)
+    rejected: int = 0
+    total: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+def _column(columns: Sequence[str], pos: int) -> str:
+    if pos < len(columns) and columns[pos]:
+        return columns[pos]
+    return ("id", "name")[pos] if pos < 2 else f"grade{pos - 1}"
+
+def _int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+def _check_fields(row_idx: int, row: List[str], columns: Sequence[str]
+                  ) -> Tuple[Optional[int], str, List[int], List[Violation]]:
+    """Разбор и проверка ячеек строки: (id, имя, оценки, нарушения)."""
+    if len(row) < 2:
+        return None, "", [], [Violation(row_idx, "name", MISSING_FIELDS, ",".join(row))]
+
+    violations = []
+    s_id = _int(row[0].strip())
+    if s_id is None:
+        violations.append(Violation(row_idx, _column(columns, 0), NOT_INTEGER, row[0]))
+    elif s_id < 0:
+        violations.append(Violation(row_idx, _column(columns, 0), NEGATIVE_ID, row[0]))
+    elif s_id > MAX_ID:
+        violations.append(Violation(row_idx, _column(columns, 0), ID_RANGE, row[0]))
+
+    name = row[1].strip()
+    if not name:
+        violations.append(Violation(row_idx, _column(columns, 1), EMPTY_NAME, row[1]))
+
+    grades = []
+    for pos in range(2, len(row)):
+        raw = row[pos].strip()
+        if not raw:
+            continue
+        g = _int(raw)
+        if g is None:
+            violations.append(Violation(row_idx, _column(columns, pos), NOT_INTEGER, raw))
+        elif not 0 <= g <= 100:
+            violations.append(Violation(row_idx, _column(columns, pos), GRADE_RANGE, raw))
+        else:
+            grades.append(g)
+
+    return s_id, name, grades, violations
+
+def check_row(row_idx: int, row: List[str], columns: Sequence[str] = (),
+              student_cls: type = Student) -> Tuple[Optional[Student], List[Violation]]:
+    """Проверяет строку CSV по всем правилам: (студент или None, нарушения)."""
+    s_id, name, grades, violations = _check_fields(row_idx, row, columns)
+    if violations:
+        return None, violations
+    try:
+        return student_cls(id=s_id, name=name, grades=grades), []
+    except ValidationError as e:  # правило модели, не покрытое проверками выше
+        return None, [Violation(row_idx, "", MODEL, str(e))]
+
+class _ChunkResult:
+    """
+    Результат проверки части файла в компактном виде (дёшево передаётся
+    между процессами): принятые строки - столбцами, номера строк - локальные.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.lines = array('q')
+        self.ids = array('q')
+        self.names: List[str] = []
+        self.offsets = array('Q', [0])
+        self.grades = array('B')
+        self.violations: List[Violation] = []
+        self.rejected: List[Row] = []
+
+def _check_range(filename: str, start: int, end: int, columns: Sequence[str]) -> _ChunkResult:
+    """Проверяет строки файла в байтах [start, end) (выполняется в процессе пула)."""
+    with open(filename, mode='rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+
+    result = _ChunkResult()
+    for row_idx, row in enumerate(csv.reader(io.StringIO(text, newline='')), start=1):
+        result.rows = row_idx
+        if not row:
+            continue
+        s_id, name, grades, found = _check_fields(row_idx, row, columns)
+        if found:
+            result.violations.extend(found)
+            result.rejected.append((row_idx, row))
+        else:
+            result.lines.append(row_idx)
+            result.ids.append(s_id)
+            result.names.append(name)
+            result.grades.extend(grades)
+            result.offsets.append(len(result.grades))
+    return result
+
+def _split(filename: str, data_start: int, parts: int) -> List[Tuple[int, int]]:
+    """Делит файл после заголовка на parts диапазонов байт по границам строк."""
+    size = os.path.getsize(filename)
+    bounds = [data_start]
+    with open(filename, mode='rb') as f:
+        for k in range(1, parts):
+            f.seek(max(data_start + (size - data_start) * k // parts, bounds[-1]))
+            f.readline()
+            if bounds[-1] < f.tell() < size:
+                bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _header(filename: str) -> Tuple[List[str], int]:
+    """Заголовок файла (или пустой список) и смещение первой строки данных в байтах."""
+    with open(filename, mode='r', encoding='utf-8', newline='') as f:
+        sample = f.read(1024)
+    if not detect_header(sample):
+        return [], 0
+    with open(filename, mode='rb') as f:
+        line = f.readline()
+        header = next(csv.reader([line.decode('utf-8')]), [])
+        return [c.strip() for c in header], f.tell()
+
+@timed()
+def validate_csv(filename: str, quarantine: Optional[str] = None,
+                 max_workers: Optional[int] = None, student_cls: type = Student) -> ValidationReport:
+    """
+    Проверяет CSV файл, поделённый на части по числу процессов: каждый
+    процесс сам читает свой диапазон байт и возвращает принятые строки
+    столбцами. С одним процессом (max_workers=1 или одно ядро) проверка
+    идёт в текущем. Повторные id отклоняются правилом duplicate_id
+    (первая строка остаётся). quarantine - файл для отклонённых строк:
+    номер строки, правила, исходные ячейки. Имена с переводом строки
+    внутри кавычек не поддерживаются.
+    """
+    if not os.path.exists(filename):
+        raise DataSourceError(f"Файл не найден: {filename}")
+
+    start = time.perf_counter()
+    try:
+        columns, data_start = _header(filename)
+        workers = max_workers or os.cpu_count() or 1
+        ranges = _split(filename, data_start, workers)
+        args = ([filename] * len(ranges), [r[0] for r in ranges], [r[1] for r in ranges],
+                [columns] * len(ranges))
+        if len(ranges) <= 1:
+            results = list(map(_check_range, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_check_range, *args))
+    except (IOError, UnicodeDecodeError, csv.Error) as e:
+        raise DataSourceError(f"Ошибка чтения CSV: {e}")
+
+    report = ValidationReport()
+    rejected: List[Row] = []
+    seen: Set[int] = set()
+    for part in results:
+        shift = report.total
+        report.total += part.rows
+        report.violations.extend(replace(v, row=v.row + shift) for v in part.violations)
+        rejected.extend((row_idx + shift, row) for row_idx, row in part.rejected)
+        for k, s_id in enumerate(part.ids):
+            grades = part.grades[part.offsets[k]:part.offsets[k + 1]].tolist()
+            row_idx = part.lines[k] + shift
+            if s_id in seen:
+                report.violations.append(Violation(row_idx, _column(columns, 0), DUPLICATE_ID, str(s_id)))
+                rejected.append((row_idx, [str(s_id), part.names[k]] + [str(g) for g in grades]))
+            else:
+                seen.add(s_id)
+                report.accepted.append(student_cls(id=s_id, name=part.names[k], grades=grades))
+
+    report.violations.sort(key=lambda v: v.row)
+    rejected.sort(key=lambda r: r[0])
+    report.rejected = len(rejected)
+    if quarantine:
+        _write_quarantine(quarantine, columns, rejected, report.violations)
+    if METRICS.enabled:
+        METRICS.add_rows(len(report.accepted), report.rejected, time.perf_counter() - start)
+    return report
+
+def _write_quarantine(filename: str, header: List[str], rejected: List[Row],
+                      violations: List[Violation]) -> None:
+    rules: Dict[int, List[str]] = {}
+    for v in violations:
+        rules.setdefault(v.row, []).append(v.rule)
+    try:
+        with open(filename, mode='w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["row", "rules"] + header)
+            for row_idx, row in rejected:
+                writer.writerow([row_idx, ";".join(sorted(set(rules[row_idx])))] + row)
+    except IOError as e:
+        raise DataSourceError(f"Ошибка записи карантина: {e}")
+
+def write_violations(filename: str, violations: List[Violation]) -> None:
+    """Сохраняет нарушения в CSV: row, column, rule, value."""
+    try:
+        with open(filename, mode='w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["row", "column", "rule", "value"])
+            for v in violations:
+                writer.writerow([v.row, v.column, v.rule, v.value])
+    except IOError as e:
+        raise DataSourceError(f"Ошибка записи отчёта: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка CSV файла с оценками")
+    parser.add_argument("file")
+    parser.add_argument("--quarantine", help="Файл для отклонённых строк (по умолчанию <файл>.quarantine.csv)")
+    parser.add_argument("--violations", help="Файл CSV со всеми нарушениями")
+    parser.add_argument("--workers", type=int, help="Число процессов (по умолчанию - по числу ядер)")
+    args = parser.parse_args()
+
+    quarantine = args.quarantine or os.path.splitext(args.file)[0] + ".quarantine.csv"
+    try:
+        report = validate_csv(args.file, quarantine, args.workers)
+        if args.violations:
+            write_violations(args.violations, report.violations)
+    except DataSourceError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    print(f"Строк: {report.total}, принято: {len(report.accepted)}, отклонено: {report.rejected}")
+    for rule, count in Counter(v.rule for v in report.violations).most_common():
+        print(f"  {rule}: {count}")
+    if report.rejected:
+        print(f"Отклонённые строки записаны в {quarantine}")
+    sys.exit(0 if report.ok else 1)
+
+if __name__ == "__main__":
+    main()
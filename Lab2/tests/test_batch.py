@@ -0,0 +1,82 @@
+import io
+import json
+from lab import batch
+from lab import processing as proc
+
+def run(registry, lines, tmp_path, name="ops.jsonl"):
+    path = tmp_path / name
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    out = io.StringIO()
+    registry, failed = batch.run_batch(registry, batch.read_operations(str(path)), out)
+    return registry, failed, [json.loads(line) for line in out.getvalue().splitlines()]
+
+def test_batch_jsonl(tmp_path, sample_students):
+    top_file = str(tmp_path / "top.csv")
+    reg, failed, results = run(proc.StudentRegistry(sample_students), [
+        '{"op": "add", "id": 4, "name": "Новиков", "grades": [100]}',
+        '{"op": "update_grades", "id": 2, "grades": [95]}',
+        '{"op": "delete", "id": 1}',
+        '{"op": "stats"}',
+        '{"op": "sort", "key": "avg"}',
+        json.dumps({"op": "export_top", "n": 2, "file": top_file}),
+    ], tmp_path)
+
+    assert failed == 0
+    assert all(r["ok"] for r in results)
+    assert results[3]["count"] == 3
+    assert results[3]["best"] == {"id": 4, "name": "Новиков", "average": 100.0}
+    assert [s.id for s in reg] == [4, 2, 3]
+    with open(top_file, encoding="utf-8") as f:
+        assert [row.split(",")[0] for row in f.read().splitlines()] == ["id", "4", "2"]
+
+def test_batch_reports_errors_and_continues(tmp_path, sample_students):
+    reg, failed, results = run(proc.StudentRegistry(sample_students), [
+        '{"op": "delete", "id": 99}',
+        'not json',
+        '{"op": "add", "id": 5}',
+        '{"op": "update_grades", "id": 1, "grades": [101]}',
+        '{"op": "launch"}',
+        '{"op": "update_grades", "id": 1, "grades": [50.9, true]}',
+        '{"op": "add", "id": 4.9, "name": "Дробный"}',
+        '{"op": "add", "id": true, "name": "Логический"}',
+        '{"op": "add", "id": "4", "name": "Строка"}',
+        '{"op": "add", "id": 5, "name": "Козлов"}',
+    ], tmp_path)
+
+    assert failed == 9
+    assert [r["ok"] for r in results] == [False] * 9 + [True]
+    assert [r["line"] for r in results] == list(range(1, 11))
+    assert "id" in results[6]["error"]
+    assert 5 in reg and 4 not in reg and 1 in reg and reg.get(1).grades == (80, 90)
+
+def test_batch_csv(tmp_path, sample_students):
+    reg, failed, results = run(proc.StudentRegistry(sample_students), [
+        "op,id,name,grades,key",
+        "add,4,Новиков,70 80,",
+        "update_grades,3,,100,",
+        "update_grades,1,,,",
+        "delete,2.0,,,",
+        "delete,1e0,,,",
+        "sort,,,,name",
+    ], tmp_path, name="ops.csv")
+
+    assert failed == 2
+    assert [r["ok"] for r in results] == [True] * 3 + [False] * 2 + [True]
+    assert reg.get(4).grades == (70, 80)
+    assert reg.get(1).grades == ()
+    assert [s.name for s in reg] == ["Иванов", "Новиков", "Петров", "Сидоров"]
+
+def test_batch_bulk_matches_incremental(tmp_path, sample_students):
+    reg = proc.StudentRegistry(sample_students)
+    reg.subscribe(proc.Leaderboard())
+    reg.subscribe(proc.GroupStats())
+    reg, failed, results = run(reg, [
+        '{"op": "add", "id": 4, "name": "Новиков", "grades": [100]}',
+        '{"op": "update_grades", "id": 3, "grades": [55]}',
+        '{"op": "delete", "id": 1}',
+        '{"op": "stats"}',
+    ], tmp_path)
+
+    assert results[-1]["best"]["id"] == 4
+    assert results[-1]["worst"]["id"] == 2
+    assert proc.get_top_n(reg, 10) == proc.sort_students(reg, 'avg')
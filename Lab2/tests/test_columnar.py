@@ -0,0 +1,32 @@
+import pytest
+from lab import processing as proc
+from lab.models import Student
+
+np = pytest.importorskip("numpy")
+from lab.columnar import GradeStore
+
+def test_store_layout(sample_students):
+    store = GradeStore.from_students(sample_students)
+    assert len(store) == 3
+    assert store.offsets.tolist() == [0, 2, 4, 4]
+    assert store.grades(1) == [60, 50]
+    assert store.student(2).grades == ()
+
+def test_store_stats_match_list(sample_students):
+    store = GradeStore.from_students(sample_students)
+    stats = proc.calculate_stats(store)
+    expected = proc.calculate_stats(sample_students)
+    assert stats['count'] == expected['count']
+    assert stats['overall_avg'] == expected['overall_avg']
+    assert stats['best'].id == expected['best'].id
+    assert stats['worst'].id == expected['worst'].id
+
+def test_store_ties_follow_stable_sort():
+    students = [Student(1, "A", [50]), Student(2, "B", [90]),
+                Student(3, "C", [90]), Student(4, "D", [50])]
+    stats = GradeStore.from_students(students).stats()
+    assert stats['best'].id == 3
+    assert stats['worst'].id == 1
+
+def test_empty_store():
+    assert GradeStore.from_students([]).stats()['best'] is None
@@ -0,0 +1,28 @@
+import argparse
+import json
+from benchmarks import harness
+
+def finish(tmp_path, results, baseline):
+    path = tmp_path / "baseline.json"
+    if baseline is not None:
+        path.write_text(json.dumps(baseline), encoding="utf-8")
+    parser = argparse.ArgumentParser()
+    harness.add_arguments(parser, str(path))
+    return harness.finish(parser.parse_args(["--check"]), results)
+
+def test_check_lists_missing_entries(tmp_path, capsys):
+    results = [harness.Result("a[10]", 0.001, 100), harness.Result("b[10]", 0.001, 100)]
+    code = finish(tmp_path, results, {"a[10]": {"seconds": 0.001, "peak_bytes": 100}})
+
+    assert code == 0
+    assert "[Нет базовых значений] b[10]" in capsys.readouterr().out
+
+def test_check_fails_when_nothing_compared(tmp_path, capsys):
+    results = [harness.Result("a[10]", 0.001, 100)]
+    assert finish(tmp_path, results, {"a[99]": {"seconds": 0.001, "peak_bytes": 100}}) == harness.EXIT_NO_BASELINE
+    assert finish(tmp_path, results, None) == harness.EXIT_NO_BASELINE
+
+def test_check_reports_regression(tmp_path, capsys):
+    results = [harness.Result("a[10]", 1.0, 100)]
+    assert finish(tmp_path, results, {"a[10]": {"seconds": 0.1, "peak_bytes": 100}}) == 1
+    assert "[Регрессия] a[10]" in capsys.readouterr().out
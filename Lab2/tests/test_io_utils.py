@@ -15,4 +15,102 @@ def test_save_load_roundtrip(tmp_path, sample_students):
 
 def test_load_bad_file():
     with pytest.raises(Exception):
-        io_utils.load_students_from_csv("non_existent.csv")
\ No newline at end of file
+        io_utils.load_students_from_csv("non_existent.csv")
+
+def test_iter_students_batches(tmp_path, sample_students):
+    f = str(tmp_path / "test.csv")
+    io_utils.save_students_to_csv(f, sample_students)
+
+    batches = list(io_utils.iter_students_from_csv(f, batch_size=2))
+    assert [len(b) for b in batches] == [2, 1]
+    assert batches[1][0].name == "Сидоров"
+
+def test_iter_students_skips_bad_rows(tmp_path):
+    f = tmp_path / "bad.csv"
+    f.write_text("id,name,grade1\n1,Иванов,80\nx,Петров,50\n3,Сидоров,70\n", encoding="utf-8")
+    assert [s.id for s in io_utils.iter_students_from_csv(str(f))] == [1, 3]
+
+def test_stats_from_stream(tmp_path, sample_students):
+    from lab import processing as proc
+    f = str(tmp_path / "test.csv")
+    io_utils.save_students_to_csv(f, sample_students)
+
+    stats = proc.calculate_stats(io_utils.iter_students_from_csv(f))
+    assert stats['count'] == 3
+    assert stats['best'].id == 1
+
+def test_bulk_load_matches_row_loader(tmp_path, sample_students):
+    pytest.importorskip("pandas")
+    f = str(tmp_path / "test.csv")
+    io_utils.save_students_to_csv(f, sample_students)
+
+    store = io_utils.load_grade_store_from_csv(f)
+    assert store.ids.tolist() == [1, 2, 3]
+    assert store.names == ["Иванов", "Петров", "Сидоров"]
+    assert [store.grades(i) for i in range(3)] == [list(s.grades) for s in sample_students]
+
+def test_bulk_load_reports_bad_rows(tmp_path, capsys):
+    pytest.importorskip("pandas")
+    f = tmp_path / "bad.csv"
+    f.write_text("id,name,grade1,grade2\n1,Иванов,80,90\n2,Петров,150,\n"
+                 "-3,Сидоров,70,\n4,,10,\n5,Кузнецов,,60\n", encoding="utf-8")
+
+    store = io_utils.load_grade_store_from_csv(str(f))
+    assert store.ids.tolist() == [1, 5]
+    assert store.grades(1) == [60]
+    out = capsys.readouterr().out
+    assert "строке 2" in out and "строке 3" in out and "строке 4" in out
+
+def test_load_shards_merges_in_order(tmp_path, sample_students):
+    io_utils.save_students_to_csv(str(tmp_path / "a.csv"), sample_students[:2])
+    io_utils.save_students_to_csv(str(tmp_path / "b.csv"), sample_students[2:])
+
+    paths = io_utils.expand_shards(str(tmp_path))
+    loaded = io_utils.load_students_from_shards(paths, max_workers=2)
+    assert loaded == sample_students
+
+def test_load_shards_serial_on_one_cpu(tmp_path, sample_students, monkeypatch):
+    io_utils.save_students_to_csv(str(tmp_path / "a.csv"), sample_students[:2])
+    io_utils.save_students_to_csv(str(tmp_path / "b.csv"), sample_students[2:])
+    monkeypatch.setattr(io_utils.os, "cpu_count", lambda: 1)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("пул процессов не нужен на одном ядре")
+    monkeypatch.setattr(io_utils, "ProcessPoolExecutor", no_pool)
+
+    loaded = io_utils.load_students_from_shards(io_utils.expand_shards(str(tmp_path)))
+    assert loaded == sample_students
+
+def test_load_shards_duplicate_ids(tmp_path, sample_students):
+    from lab.errors import DuplicateIdError
+    io_utils.save_students_to_csv(str(tmp_path / "a.csv"), sample_students)
+    io_utils.save_students_to_csv(str(tmp_path / "b.csv"), sample_students[:1])
+
+    with pytest.raises(DuplicateIdError, match="b.csv"):
+        io_utils.load_students_from_shards(io_utils.expand_shards(str(tmp_path / "*.csv")))
+
+def test_bulk_load_parses_like_row_loader(tmp_path, capsys):
+    pytest.importorskip("pandas")
+    f = tmp_path / "ints.csv"
+    f.write_text("id,name,grade1\n9007199254740993,NA,80\n99999999999999999999,Большой,60\n"
+                 "3,None,1e2\n4,Кузнецов,80.0\n5,Орлов, 070\n", encoding="utf-8")
+
+    store = io_utils.load_grade_store_from_csv(str(f))
+    assert store.ids.tolist() == [9007199254740993, 5]
+    assert store.names == ["NA", "Орлов"]
+    assert [store.grades(i) for i in range(2)] == [[80], [70]]
+    out = capsys.readouterr().out
+    assert all(f"строке {i}" in out for i in (2, 3, 4))
+
+def test_bulk_load_ragged_columns(tmp_path, capsys):
+    pytest.importorskip("pandas")
+    f = tmp_path / "ragged.csv"
+    f.write_text("9007199254740993,Иванов,80,\n2,Петров,,70\n"
+                 ",Сидоров,60,\n4,Кузнецов,90.0,\n5,Орлов,+7,1e1\n6,Козлов,, 5 \n", encoding="utf-8")
+
+    store = io_utils.load_grade_store_from_csv(str(f))
+    out = capsys.readouterr().out
+    assert "'90.0'" in out and "'1e1'" in out and "строке 3" in out
+    assert store.ids.tolist() == [9007199254740993, 2, 6]
+    assert [store.grades(i) for i in range(3)] == [[80], [70], [5]]
+    assert store.ids.tolist() == [s.id for s in io_utils.load_students_from_csv(str(f))]
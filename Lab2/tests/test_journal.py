@@ -0,0 +1,87 @@
+import os
+import pytest
+from lab import processing as proc
+from lab.io_utils import save_students_to_csv, load_students_from_csv
+from lab.journal import Journal, replay_journal
+
+def test_journal_replay(tmp_path, sample_students):
+    base = str(tmp_path / "roster.csv")
+    save_students_to_csv(base, sample_students)
+
+    reg = replay_journal(base)
+    journal = Journal(base)
+    journal.attach(reg)
+    proc.add_student(reg, 4, "Новиков")
+    proc.update_grades(reg, 4, [70, 80])
+    proc.delete_student(reg, 2)
+    journal.close()
+
+    assert len(load_students_from_csv(base)) == 3
+    restored = replay_journal(base)
+    assert [s.id for s in restored] == [1, 3, 4]
+    assert restored.get(4).grades == (70, 80)
+
+def test_journal_compaction(tmp_path, sample_students):
+    base = str(tmp_path / "roster.csv")
+    reg = proc.StudentRegistry(sample_students)
+    journal = Journal(base, compact_every=2)
+    journal.attach(reg)
+    proc.add_student(reg, 4, "Новиков")
+    proc.delete_student(reg, 1)
+    journal.close()
+
+    assert [s.id for s in load_students_from_csv(base)] == [2, 3, 4]
+    assert (tmp_path / "roster.csv.log").read_text(encoding="utf-8") == ""
+    assert [s.id for s in replay_journal(base)] == [2, 3, 4]
+
+def test_replay_skips_torn_record(tmp_path, capsys):
+    base = str(tmp_path / "roster.csv")
+    (tmp_path / "roster.csv.log").write_text(
+        '{"op": "add", "id": 1, "name": "Иванов", "grades": [90]}\n{"op": "add", "id"',
+        encoding="utf-8")
+
+    assert [s.id for s in replay_journal(base)] == [1]
+    assert "Повреждена" in capsys.readouterr().out
+
+def test_replay_after_crash_during_compaction(tmp_path, sample_students, monkeypatch):
+    base = str(tmp_path / "roster.csv")
+    save_students_to_csv(base, sample_students)
+    reg = replay_journal(base)
+    journal = Journal(base)
+    journal.attach(reg)
+    proc.add_student(reg, 4, "Новиков")
+    proc.delete_student(reg, 2)
+
+    real_replace = os.replace
+    def replace_then_crash(src, dst):
+        real_replace(src, dst)
+        raise KeyboardInterrupt  # обрыв между заменой базы и очисткой журнала
+
+    monkeypatch.setattr(os, "replace", replace_then_crash)
+    with pytest.raises(KeyboardInterrupt):
+        journal.compact()
+    monkeypatch.undo()
+    journal.close()
+
+    assert [s.id for s in load_students_from_csv(base)] == [1, 3, 4]
+    assert (tmp_path / "roster.csv.log").read_text(encoding="utf-8") != ""
+    assert [s.id for s in replay_journal(base)] == [1, 3, 4]
+
+def test_sort_is_one_record(tmp_path, sample_students):
+    base = str(tmp_path / "roster.csv")
+    save_students_to_csv(base, sample_students)
+    original = (tmp_path / "roster.csv").read_bytes()
+
+    reg = replay_journal(base)
+    journal = Journal(base)
+    journal.attach(reg)
+    proc.update_grades(reg, 3, [100])
+    reg = proc.StudentRegistry(proc.sort_students(reg, 'avg'))
+    journal.attach(reg)
+    journal.record_sort('avg')
+    proc.add_student(reg, 4, "Новиков")
+    journal.close()
+
+    assert (tmp_path / "roster.csv").read_bytes() == original
+    assert len((tmp_path / "roster.csv.log").read_text(encoding="utf-8").splitlines()) == 3
+    assert [s.id for s in replay_journal(base)] == [3, 1, 2, 4]
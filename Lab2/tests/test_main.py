@@ -0,0 +1,41 @@
+import pytest
+from lab import io_utils
+from lab.main import load_roster, save_roster
+
+@pytest.mark.parametrize("name", ["roster.csv", "roster.snap"])
+def test_load_roster_file(tmp_path, sample_students, name):
+    f = str(tmp_path / name)
+    save_roster(f, sample_students)
+
+    students = load_roster(f)
+    assert list(students) == sample_students
+    assert students.get(2).name == "Петров"
+
+def test_load_roster_shard_dir(tmp_path, sample_students):
+    io_utils.save_students_to_csv(str(tmp_path / "a.csv"), sample_students[:2])
+    io_utils.save_students_to_csv(str(tmp_path / "b.csv"), sample_students[2:])
+
+    students = load_roster(str(tmp_path))
+    assert [s.id for s in students] == [1, 2, 3]
+    assert students.get(3).name == "Сидоров"
+
+def test_attach_journal_compacts_only_on_load(tmp_path, sample_students):
+    from lab.journal import Journal, replay_journal
+    from lab.main import attach_journal, new_registry
+    from lab import processing as proc
+    base = str(tmp_path / "roster.csv")
+    log = tmp_path / "roster.csv.log"
+    journal = Journal(base)
+
+    students = new_registry(sample_students)
+    attach_journal(journal, students)
+    assert [s.id for s in io_utils.load_students_from_csv(base)] == [1, 2, 3]
+
+    proc.update_grades(students, 3, [100])
+    students = new_registry(proc.sort_students(students, 'avg'))
+    attach_journal(journal, students, sorted_by='avg')
+    journal.close()
+
+    assert [s.id for s in io_utils.load_students_from_csv(base)] == [1, 2, 3]
+    assert log.read_text(encoding="utf-8").splitlines()[-1] == '{"op": "sort", "key": "avg"}'
+    assert [s.id for s in replay_journal(base)] == [3, 1, 2]
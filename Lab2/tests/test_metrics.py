@@ -0,0 +1,51 @@
+import pytest
+from lab import processing as proc
+from lab.io_utils import load_students_from_csv
+from lab.metrics import METRICS, Timer, enable, timed
+
+@pytest.fixture
+def metrics():
+    METRICS.reset()
+    enable()
+    yield METRICS
+    enable(False)
+    METRICS.reset()
+
+def test_timed_disabled_records_nothing():
+    METRICS.reset()
+    proc.calculate_stats([])
+    assert METRICS.timers == {}
+
+def test_timed_counts_calls_and_errors(metrics, sample_students):
+    proc.calculate_stats(sample_students)
+    proc.calculate_stats(sample_students)
+    with pytest.raises(Exception):
+        proc.delete_student(sample_students, 99)
+
+    assert metrics.timers["processing.calculate_stats"].count == 2
+    assert metrics.timers["processing.delete_student"].errors == 1
+
+def test_timed_custom_name(metrics):
+    @timed("custom")
+    def f(x):
+        return x * 2
+
+    assert f(2) == 4
+    assert metrics.timers["custom"].count == 1
+
+def test_rows_parsed_and_rejected(metrics, tmp_path):
+    p = tmp_path / "rows.csv"
+    p.write_text("id,name,g1\n1,Иванов,90\nx,Битый,1\n2,Петров,80\n", encoding="utf-8")
+    load_students_from_csv(str(p))
+
+    assert metrics.rows_parsed == 2
+    assert metrics.rows_rejected == 1
+    assert "отклонено: 1" in metrics.report()
+
+def test_timer_percentiles():
+    t = Timer()
+    for ms in range(1, 101):
+        t.add(ms / 1000)
+    assert t.percentile(50) == pytest.approx(0.050)
+    assert t.percentile(95) == pytest.approx(0.095)
+    assert t.percentile(100) == pytest.approx(0.100)
@@ -16,4 +16,48 @@ def test_validation_error_negative_grade():
 
 def test_validation_error_empty_name():
     with pytest.raises(ValidationError):
-        Student(1, "", [50])
\ No newline at end of file
+        Student(1, "", [50])
+
+def test_average_cache_invalidated_on_new_grades():
+    s = Student(1, "Test", [10, 20])
+    assert s.average == 15.0
+    s.grades = [100]
+    assert s.average == 100.0
+    assert (s.grades_sum, s.grades_count) == (100, 1)
+
+def test_compact_student_matches_student():
+    from lab.models import CompactStudent
+    s = Student(1, "Test", [10, 20])
+    c = CompactStudent(1, "Test", [10, 20])
+    assert c.average == s.average
+    assert str(c) == str(s)
+    assert c == s
+    assert not hasattr(c, "__dict__")
+
+def test_compact_student_validation():
+    from lab.models import CompactStudent
+    with pytest.raises(ValidationError):
+        CompactStudent(1, "Test", [101])
+    with pytest.raises(ValidationError):
+        CompactStudent(1, "Test", [-1])
+    with pytest.raises(ValidationError):
+        CompactStudent(1, " ", [50])
+
+def test_grades_cannot_change_in_place():
+    s = Student(1, "Test", [10])
+    assert s.grades == (10,)
+    with pytest.raises(AttributeError):
+        s.grades.append(90)
+    assert s.average == 10.0
+    assert str(s).endswith("Оценки: [10]")
+
+@pytest.mark.parametrize("field", ["id", "name"])
+def test_key_fields_are_read_only(field):
+    from lab.models import CompactStudent
+    from lab import processing as proc
+    for cls in (Student, CompactStudent):
+        reg = proc.StudentRegistry([cls(1, "Борисов", [10]), cls(2, "Андреев", [20])])
+        reg.subscribe(proc.SortIndex('name'))
+        with pytest.raises(AttributeError, match=field):
+            setattr(reg.get(1), field, "Яковлев" if field == "name" else 3)
+        assert [s.id for s in proc.sort_students(reg, 'name')] == [2, 1]
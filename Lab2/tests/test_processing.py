@@ -20,4 +20,129 @@ def test_group_stats(sample_students):
     stats = proc.calculate_stats(sample_students)
     assert stats['count'] == 3
     # (80+90+60+50)/4 = 280/4 = 70
-    assert stats['overall_avg'] == 70.0
\ No newline at end of file
+    assert stats['overall_avg'] == 70.0
+
+def test_registry_lookup_and_order(sample_students):
+    reg = proc.StudentRegistry(sample_students)
+    assert len(reg) == 3
+    assert proc.get_student_by_id(reg, 2).name == "Петров"
+    assert [s.id for s in reg] == [1, 2, 3]
+
+def test_registry_add_delete(sample_students):
+    reg = proc.StudentRegistry(sample_students)
+    proc.add_student(reg, 4, "Новиков")
+    proc.delete_student(reg, 1)
+    assert [s.id for s in reg] == [2, 3, 4]
+    with pytest.raises(DuplicateIdError):
+        proc.add_student(reg, 2, "Clone")
+    with pytest.raises(StudentNotFoundError):
+        proc.delete_student(reg, 1)
+
+def test_top_n_keeps_tie_break():
+    from lab.models import Student
+    students = [Student(1, "Б", [70]), Student(2, "А", [70]),
+                Student(3, "В", [90]), Student(4, "А", [70])]
+    top = proc.get_top_n(iter(students), 3)
+    assert [s.id for s in top] == [3, 2, 4]
+    assert top == proc.sort_students(students, 'avg')[:3]
+
+def test_leaderboard_follows_mutations(sample_students):
+    reg = proc.StudentRegistry(sample_students)
+    reg.subscribe(proc.Leaderboard())
+    assert [s.id for s in proc.get_top_n(reg, 2)] == [1, 2]
+
+    proc.update_grades(reg, 3, [100])
+    proc.add_student(reg, 4, "Новиков")
+    proc.delete_student(reg, 1)
+    assert [s.id for s in proc.get_top_n(reg, 10)] == [3, 2, 4]
+    assert proc.get_top_n(reg, 10) == proc.sort_students(reg, 'avg')
+
+def test_group_stats_incremental(sample_students):
+    reg = proc.StudentRegistry(sample_students)
+    reg.subscribe(proc.GroupStats())
+
+    proc.update_grades(reg, 3, [100, 100])
+    proc.add_student(reg, 4, "Новиков")
+    proc.delete_student(reg, 2)
+    stats = proc.calculate_stats(reg)
+    expected = proc.calculate_stats(list(reg))
+    assert stats == expected
+    assert stats['best'].id == 3
+    assert stats['worst'].id == 4
+
+def test_bulk_rebuilds_indexes_once(sample_students):
+    reg = proc.StudentRegistry(sample_students)
+    reg.subscribe(proc.Leaderboard())
+    reg.subscribe(proc.GroupStats())
+
+    with reg.bulk():
+        proc.update_grades(reg, 3, [100])
+        proc.add_student(reg, 4, "Новиков")
+        proc.delete_student(reg, 1)
+        assert reg.listener(proc.Leaderboard) is None
+
+    assert proc.get_top_n(reg, 10) == proc.sort_students(reg, 'avg')
+    assert proc.calculate_stats(reg) == proc.calculate_stats(list(reg))
+
+def test_bulk_merges_repeated_changes(sample_students):
+    reg = proc.StudentRegistry(sample_students)
+    reg.subscribe(proc.GroupStats())
+    for key in ('avg', 'name', 'id'):
+        reg.subscribe(proc.SortIndex(key))
+
+    with reg.bulk():
+        proc.add_student(reg, 4, "Андреев")
+        proc.update_grades(reg, 4, [95])
+        proc.update_grades(reg, 4, [40])
+        proc.update_grades(reg, 2, [99])
+        proc.delete_student(reg, 1)
+        proc.add_student(reg, 1, "Яковлев")
+        proc.delete_student(reg, 3)
+
+    for key in ('avg', 'name', 'id'):
+        assert proc.sort_students(reg, key) == proc.sort_students(list(reg), key)
+    assert proc.calculate_stats(reg) == proc.calculate_stats(list(reg))
+    proc.update_grades(reg, 1, [100])
+    assert proc.get_top_n(reg, 1)[0].id == 1
+
+def test_bulk_applies_few_changes_in_place():
+    from lab.models import Student
+    reg = proc.StudentRegistry(Student(i, f"С{i:03}", [i % 101]) for i in range(300))
+    reg.subscribe(proc.Leaderboard())
+    reg.subscribe(proc.GroupStats())
+
+    with reg.bulk():
+        proc.update_grades(reg, 5, [100])
+        proc.delete_student(reg, 7)
+        proc.add_student(reg, 7, "Новиков")
+
+    assert proc.get_top_n(reg, 300) == proc.sort_students(list(reg), 'avg')
+    assert proc.calculate_stats(reg) == proc.calculate_stats(list(reg))
+
+def test_sort_indexes_match_full_sort(sample_students):
+    reg = proc.StudentRegistry(sample_students)
+    for key in ('avg', 'name', 'id'):
+        reg.subscribe(proc.SortIndex(key))
+
+    proc.add_student(reg, 0, "Андреев")
+    proc.update_grades(reg, 3, [70])
+    proc.delete_student(reg, 2)
+    for key in ('avg', 'name', 'id'):
+        assert proc.sort_students(reg, key) == proc.sort_students(list(reg), key)
+        assert proc.page_students(reg, key, 1, 2) == proc.sort_students(list(reg), key)[1:3]
+        assert proc.page_students(list(reg), key, 1, 2) == proc.sort_students(list(reg), key)[1:3]
+
+def test_range_and_prefix_queries(sample_students):
+    reg = proc.StudentRegistry(sample_students)
+    reg.subscribe(proc.Leaderboard())
+    reg.subscribe(proc.SortIndex('name'))
+    proc.add_student(reg, 4, "Иванова")
+    proc.update_grades(reg, 4, [55])
+
+    assert [s.id for s in proc.students_in_avg_range(reg, 55, 85)] == [1, 4, 2]
+    assert [s.id for s in proc.students_in_avg_range(reg, 56, 85)] == [1]
+    assert [s.id for s in proc.students_by_name_prefix(reg, "Иванов")] == [1, 4]
+    assert proc.students_by_name_prefix(reg, "Я") == []
+    plain = list(reg)
+    assert proc.students_in_avg_range(plain, 55, 85) == proc.students_in_avg_range(reg, 55, 85)
+    assert proc.students_by_name_prefix(plain, "Иванов") == proc.students_by_name_prefix(reg, "Иванов")
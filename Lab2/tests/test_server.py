@@ -0,0 +1,92 @@
+import asyncio
+import json
+from lab import processing as proc
+from lab.server import RosterService, serve
+
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    if b"Transfer-Encoding: chunked" in head:
+        chunks = b""
+        while True:
+            size, _, payload = payload.partition(b"\r\n")
+            if int(size, 16) == 0:
+                break
+            chunks, payload = chunks + payload[:int(size, 16)], payload[int(size, 16) + 2:]
+        return status, [json.loads(line) for line in chunks.decode("utf-8").splitlines()]
+    return status, json.loads(payload)
+
+def with_server(students, scenario):
+    async def run():
+        registry = proc.StudentRegistry(students)
+        registry.subscribe(proc.Leaderboard())
+        registry.subscribe(proc.GroupStats())
+        server = await serve(registry, port=0)
+        async with server:
+            return await scenario(server.sockets[0].getsockname()[1])
+    return asyncio.run(run())
+
+def test_lookup_and_listing(sample_students):
+    async def scenario(port):
+        status, student = await request(port, "GET", "/students/1")
+        assert status == 200 and student["name"] == "Иванов" and student["grades"] == [80, 90]
+        status, _ = await request(port, "GET", "/students/42")
+        assert status == 404
+        status, listing = await request(port, "GET", "/students")
+        assert status == 200 and [s["id"] for s in listing] == [1, 2, 3]
+    with_server(sample_students, scenario)
+
+def test_update_invalidates_cached_stats(sample_students):
+    async def scenario(port):
+        _, stats = await request(port, "GET", "/stats")
+        assert stats["best"]["id"] == 1
+        _, top = await request(port, "GET", "/top?n=1")
+        assert [s["id"] for s in top] == [1]
+
+        status, student = await request(port, "PUT", "/students/3/grades", {"grades": [100]})
+        assert status == 200 and student["average"] == 100.0
+        status, _ = await request(port, "PUT", "/students/3/grades", {"grades": [101]})
+        assert status == 400
+        status, _ = await request(port, "PUT", "/students/3/grades", {"grades": [True, False]})
+        assert status == 400
+
+        _, stats = await request(port, "GET", "/stats")
+        assert stats["best"]["id"] == 3
+        _, top = await request(port, "GET", "/top?n=1")
+        assert [s["id"] for s in top] == [3]
+    with_server(sample_students, scenario)
+
+def test_concurrent_readers_and_writers(sample_students):
+    async def scenario(port):
+        writes = [request(port, "PUT", "/students/2/grades", {"grades": [g]}) for g in range(50)]
+        reads = [request(port, "GET", "/top?n=3") for _ in range(50)]
+        results = await asyncio.gather(*writes, *reads)
+        assert all(status == 200 for status, _ in results)
+        _, student = await request(port, "GET", "/students/2")
+        assert len(student["grades"]) == 1
+    with_server(sample_students, scenario)
+
+def test_top_cache_is_bounded(sample_students):
+    service = RosterService(proc.StudentRegistry(sample_students))
+    service.cache.max_entries = 2
+
+    assert [s["id"] for s in json.loads(service.top(10 ** 9))] == [1, 2, 3]
+    for n in range(-5, 100):
+        service.top(n)
+    assert len(service.cache) == 2
+    assert json.loads(service.top(-1)) == []
+
+def test_negative_content_length_rejected(sample_students):
+    async def scenario(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"PUT /students/1/grades HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+        raw = await reader.read()
+        writer.close()
+        assert raw.split()[1] == b"400"
+    with_server(sample_students, scenario)
@@ -0,0 +1,38 @@
+import pytest
+from lab import snapshot
+from lab import io_utils
+from lab.errors import DataSourceError
+
+def test_snapshot_roundtrip(tmp_path, sample_students):
+    f = str(tmp_path / "roster.snap")
+    snapshot.save_students_to_snapshot(f, sample_students)
+
+    with snapshot.open_snapshot(f) as roster:
+        assert len(roster) == 3
+        assert list(roster) == sample_students
+
+def test_snapshot_lookup_by_id(tmp_path, sample_students):
+    f = str(tmp_path / "roster.snap")
+    snapshot.save_students_to_snapshot(f, reversed(sample_students))
+
+    with snapshot.open_snapshot(f) as roster:
+        assert roster.get(2).name == "Петров"
+        assert roster.get(3).grades == ()
+        assert roster.get(42) is None
+        assert 1 in roster
+
+def test_snapshot_csv_conversion(tmp_path, sample_students):
+    csv_in = str(tmp_path / "in.csv")
+    snap = str(tmp_path / "roster.snap")
+    csv_out = str(tmp_path / "out.csv")
+    io_utils.save_students_to_csv(csv_in, sample_students)
+
+    snapshot.csv_to_snapshot(csv_in, snap)
+    snapshot.snapshot_to_csv(snap, csv_out)
+    assert io_utils.load_students_from_csv(csv_out) == sample_students
+
+def test_open_not_a_snapshot(tmp_path):
+    f = tmp_path / "bad.snap"
+    f.write_bytes(b"id,name\n1,x\n" * 10)
+    with pytest.raises(DataSourceError):
+        snapshot.open_snapshot(str(f))
@@ -0,0 +1,45 @@
+import csv
+from lab import io_utils
+from lab.validation import validate_csv, check_row, Violation
+
+BAD_FILE = ("id,name,grade1,grade2\n"
+            "1,Иванов,80,90\n"
+            "2,Петров,150,abc\n"
+            "-3,,70,\n"
+            "4,Кузнецов,,60\n"
+            "1,Повтор,50,\n"
+            "5\n"
+            "99999999999999999999,Большой,60\n")
+
+def test_check_row_collects_all_violations():
+    student, violations = check_row(7, ["-3", " ", "101", "x"], ["id", "name", "g1", "g2"])
+    assert student is None
+    assert [(v.column, v.rule) for v in violations] == [
+        ("id", "negative_id"), ("name", "empty_name"), ("g1", "grade_range"), ("g2", "not_integer")]
+
+def test_validate_csv_accepts_good_rows(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text(BAD_FILE, encoding="utf-8")
+    quarantine = tmp_path / "bad.csv"
+
+    report = validate_csv(str(f), quarantine=str(quarantine), max_workers=2)
+
+    assert [s.id for s in report.accepted] == [1, 4]
+    assert report.accepted[1].grades == (60,)
+    assert report.total == 7 and report.rejected == 5
+    assert Violation(2, "grade1", "grade_range", "150") in report.violations
+    assert Violation(2, "grade2", "not_integer", "abc") in report.violations
+    assert Violation(5, "id", "duplicate_id", "1") in report.violations
+    assert Violation(7, "id", "id_range", "99999999999999999999") in report.violations
+    assert [v.row for v in report.violations] == sorted(v.row for v in report.violations)
+
+    with open(quarantine, encoding="utf-8", newline="") as q:
+        rows = list(csv.reader(q))
+    assert rows[0] == ["row", "rules", "id", "name", "grade1", "grade2"]
+    assert [r[0] for r in rows[1:]] == ["2", "3", "5", "6", "7"]
+    assert rows[1][1] == "grade_range;not_integer"
+
+def test_row_loader_skips_invalid_rows(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text(BAD_FILE, encoding="utf-8")
+    assert [s.id for s in io_utils.load_students_from_csv(str(f))] == [1, 4, 1, 99999999999999999999]
@@ -0,0 +1,61 @@
+"""
+Бенчмарки этапов credit_analysis на синтетических данных German Credit.
+
+Запуск из каталога Lab3:
+    python -m benchmarks.stages [--sizes 1000,100000] [--save-baseline | --check]
+
+Кеши этапов обходятся (вызываются функции __wrapped__), так что
+замеряется сама работа этапа.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks import harness
+from credit_analysis import plotting, stages, streaming
+from credit_analysis.data import parse_german_credit
+from credit_analysis.synthetic import write_german_data
+
+def bench_size(n: int, workdir: str, repeat: int):
+    path = os.path.join(workdir, f"german_{n}.data")
+    write_german_data(path, n)
+    df = parse_german_credit(path)
+    df['credit_risk_label'] = df['credit_risk'].map({1: 'Good', 2: 'Bad'})
+    encoded = stages.variables.__wrapped__(df)['encoded']
+    charts_dir = os.path.join(workdir, f"charts_{n}")
+    results = []
+
+    def run(name, func, setup=None):
+        results.append(harness.measure(f"{name}[{n}]", func, setup, repeat))
+
+    def clean_charts():
+        shutil.rmtree(charts_dir, ignore_errors=True)
+
+    run("load", lambda: parse_german_credit(path))
+    run("variables", lambda: stages.variables.__wrapped__(df))
+    run("relations", lambda: stages.relations.__wrapped__(df, encoded))
+    run("plots_aggregate", lambda: plotting.chart_inputs(df, encoded))
+    run("plots_render", lambda: plotting.render_all(df, encoded, out_dir=charts_dir), clean_charts)
+    run("sql", lambda: stages.sql.__wrapped__(df))
+    run("segments", lambda: stages.segments.__wrapped__(df))
+    cube = stages.segments.__wrapped__(df)["cube"]
+    run("segments_new_slice", lambda: (cube._memo.clear(), cube.query(("purpose", "savings"))))
+    run("streaming", lambda: streaming.analyze(streaming.iter_csv_chunks(path, chunksize=50000)))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки этапов анализа German Credit")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Число строк через запятую")
+    harness.add_arguments(parser, os.path.join(os.path.dirname(__file__), "baseline.json"))
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in (int(float(s)) for s in args.sizes.split(",")):
+            results.extend(bench_size(n, workdir, args.repeat))
+    sys.exit(harness.finish(args, results))
+
+if __name__ == "__main__":
+    main()
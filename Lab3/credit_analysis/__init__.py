@@ -0,0 +1,10 @@
+"""
+Анализ датасета German Credit, разбитый на этапы.
+
+Этапы (load, variables, relations, plots, sql) - функции с явными входами
+и выходами в credit_analysis.stages; результаты кешируются на диске по хешу
+входов. Тяжёлые библиотеки (matplotlib, seaborn) импортируются
+только внутри тех этапов, которым они нужны.
+
+Запуск: python -m credit_analysis [--stages variables,relations] [--source PATH]
+"""
@@ -0,0 +1,53 @@
+import argparse
+import sys
+
+from credit_analysis.cube import levels
+from credit_analysis.data import DataLoadError
+from credit_analysis.pipeline import STAGE_ORDER, STREAMING_STAGES, run, run_streaming
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Анализ датасета German Credit")
+    parser.add_argument("source", nargs="?", help="Путь к german.data или URL (по умолчанию UCI)")
+    parser.add_argument("--stages", help=f"Этапы через запятую: {', '.join(STAGE_ORDER)} (по умолчанию все)")
+    parser.add_argument("--output", default="german_credit_analysis.png", help="Файл для графиков")
+    parser.add_argument("--show", action="store_true", help="Показать графики в окне")
+    parser.add_argument("--plot-dir", help="Безголовый режим: каждый график - отдельный файл в этом каталоге")
+    parser.add_argument("--format", choices=["png", "svg"], default="png", help="Формат файлов для --plot-dir")
+    parser.add_argument("--db", help="Файл SQLite для накопления данных (по умолчанию база в памяти)")
+    parser.add_argument("--chunksize", type=int,
+                        help="Потоковый режим: читать данные частями по N строк (этапы load, variables, relations, sql, segments)")
+    parser.add_argument("--from-db", help="Потоковый режим: читать данные из таблицы clients этой базы SQLite")
+    parser.add_argument("--slice", action="append", metavar="DIMS",
+                        help="Срез этапа segments: измерения через запятую, например housing,age_bucket "
+                             "(можно повторять; по умолчанию стандартный набор)")
+    args = parser.parse_args(argv)
+
+    selected = [s.strip() for s in (args.stages or "").split(",") if s.strip()] or None
+    unknown = [s for s in selected or [] if s not in STAGE_ORDER]
+    if unknown:
+        parser.error(f"неизвестные этапы: {', '.join(unknown)}")
+    slices = [tuple(d.strip() for d in spec.split(",") if d.strip()) for spec in args.slice or []]
+    try:
+        for dims in slices:
+            for d in dims:
+                levels(d)
+    except ValueError as e:
+        parser.error(str(e))
+    streaming = bool(args.chunksize or args.from_db)
+    if streaming and selected and not set(selected) <= set(STREAMING_STAGES):
+        parser.error(f"в потоковом режиме доступны этапы: {', '.join(STREAMING_STAGES)}")
+
+    try:
+        if streaming:
+            run_streaming(selected, source=args.source, chunksize=args.chunksize or 100000,
+                          db_path=args.db, from_db=args.from_db, slices=slices)
+        else:
+            run(selected, source=args.source, output=args.output, show=args.show, db_path=args.db,
+                plot_dir=args.plot_dir, plot_format=args.format, slices=slices)
+    except DataLoadError as e:
+        print(f"Ошибка загрузки: {e}")
+        sys.exit(1)
+    print("\nРабота завершена.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Дисковый кеш результатов этапов, ключ - хеш входных данных.
+"""
+import functools
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from credit_analysis.data import CACHE_DIR
+
+STAGE_CACHE_DIR = CACHE_DIR / "stages"
+
+# Увеличивать при изменении формата результатов этапов
+CACHE_VERSION = 4
+
+def fingerprint(obj: Any) -> str:
+    """Стабильный хеш входа этапа; DataFrame, Series и массивы хешируются по содержимому."""
+    import numpy as np
+    import pandas as pd
+
+    h = hashlib.sha256()
+    if isinstance(obj, pd.DataFrame):
+        h.update(repr(list(obj.columns)).encode())
+        h.update(repr(list(obj.dtypes.astype(str))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(repr((obj.name, str(obj.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, np.ndarray) and obj.dtype != object:
+        h.update(repr((obj.dtype.str, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        for key in sorted(obj):
+            h.update(repr(key).encode())
+            h.update(fingerprint(obj[key]).encode())
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            h.update(fingerprint(item).encode())
+    else:
+        h.update(repr(obj).encode())
+    return h.hexdigest()
+
+def cached_stage(func: Optional[Callable] = None, *, valid: Optional[Callable[[Any], bool]] = None):
+    """
+    Кеширует результат этапа в pickle-файле <имя>-<хеш входов>.pkl.
+    valid - проверка, что закешированный результат ещё пригоден
+    (например, что файл с графиком не удалён).
+    """
+    if func is None:
+        return functools.partial(cached_stage, valid=valid)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        h = hashlib.sha256(f"{func.__name__}:{CACHE_VERSION}".encode())
+        for arg in args:
+            h.update(fingerprint(arg).encode())
+        for key in sorted(kwargs):
+            h.update(key.encode())
+            h.update(fingerprint(kwargs[key]).encode())
+        path = Path(STAGE_CACHE_DIR) / f"{func.__name__}-{h.hexdigest()[:32]}.pkl"
+
+        if path.exists():
+            try:
+                with open(path, 'rb') as f:
+                    result = pickle.load(f)
+                if valid is None or valid(result):
+                    return result
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+
+        result = func(*args, **kwargs)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return result
+
+    return wrapper
@@ -0,0 +1,152 @@
+"""
+Аналитика по сегментам риска: куб агрегатов по категориальным измерениям.
+
+Куб хранит для каждой ячейки (комбинации уровней всех измерений) число
+заявок, число плохих кредитов и суммы числовых показателей. Ячейки
+заполняются одним векторным проходом (np.bincount по составному коду),
+а срез по любому подмножеству измерений получается суммированием куба
+по остальным осям, без обращения к строкам. Срезы запоминаются до
+следующего update. Уровни измерений фиксированы (CATEGORY_LEVELS и
+возрастные группы), поэтому кубы с разных частей данных складываются
+(merge) - так же, как накопители потокового режима.
+"""
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from credit_analysis.data import CATEGORY_LEVELS
+from credit_analysis.encoding import CategoricalEncoder
+
+# Левые границы возрастных групп и их подписи
+AGE_BINS = (0, 26, 36, 46, 61)
+AGE_LABELS = ['до 25', '26-35', '36-45', '46-60', '61+']
+AGE_DIMENSION = 'age_bucket'
+
+DEFAULT_DIMENSIONS = ('purpose', 'housing', 'savings', AGE_DIMENSION)
+DEFAULT_MEASURES = ('credit_amount', 'duration')
+DEFAULT_SLICES = (('purpose',), ('housing',), ('savings',), (AGE_DIMENSION,),
+                  ('housing', AGE_DIMENSION))
+
+# Ограничение на размер куба: произведение числа уровней всех измерений
+MAX_CELLS = 1_000_000
+
+_ENCODER = CategoricalEncoder.from_categories(CATEGORY_LEVELS)
+
+def levels(dimension: str) -> List[str]:
+    """Уровни измерения в порядке осей куба."""
+    if dimension == AGE_DIMENSION:
+        return AGE_LABELS
+    if dimension not in _ENCODER.categories_:
+        raise ValueError(f"Неизвестное измерение: {dimension}")
+    return _ENCODER.categories_[dimension]
+
+class SegmentCube:
+    """
+    Куб count / bad / суммы measures по измерениям dimensions
+    (категориальные столбцы и 'age_bucket').
+    """
+
+    def __init__(self, dimensions: Sequence[str] = DEFAULT_DIMENSIONS,
+                 measures: Sequence[str] = DEFAULT_MEASURES):
+        self.dimensions = tuple(dimensions)
+        self.measures = tuple(measures)
+        if len(set(self.dimensions)) != len(self.dimensions):
+            raise ValueError("Измерения куба не должны повторяться.")
+        self.shape = tuple(len(levels(d)) for d in self.dimensions)
+        size = int(np.prod(self.shape, dtype=np.int64))
+        if size > MAX_CELLS:
+            raise ValueError(f"Слишком большой куб: {size} ячеек (допустимо {MAX_CELLS}).")
+        self.count = np.zeros(size, dtype=np.int64)
+        self.bad = np.zeros(size, dtype=np.int64)
+        self.sums = {m: np.zeros(size) for m in self.measures}
+        self.skipped = 0
+        self._memo: Dict[Tuple[str, ...], pd.DataFrame] = {}
+
+    def _codes(self, df: pd.DataFrame, dimension: str) -> np.ndarray:
+        if dimension == AGE_DIMENSION:
+            return np.searchsorted(AGE_BINS, df['age'].to_numpy(), side='right') - 1
+        return _ENCODER.transform(df[[dimension]])[dimension].to_numpy()
+
+    def update(self, df: pd.DataFrame) -> "SegmentCube":
+        """Добавляет строки df в куб; строки с неизвестным уровнем считаются в skipped."""
+        codes = [self._codes(df, d) for d in self.dimensions]
+        valid = np.logical_and.reduce([c >= 0 for c in codes]) if codes else np.ones(len(df), bool)
+        self.skipped += int(len(df) - valid.sum())
+
+        size = len(self.count)
+        if codes:
+            flat = np.ravel_multi_index([c[valid] for c in codes], self.shape)
+        else:
+            flat = np.zeros(int(valid.sum()), dtype=np.intp)
+        self.count += np.bincount(flat, minlength=size)
+        bad = df['credit_risk'].to_numpy()[valid] == 2
+        self.bad += np.bincount(flat, weights=bad, minlength=size).astype(np.int64)
+        for m in self.measures:
+            self.sums[m] += np.bincount(flat, weights=df[m].to_numpy(dtype=np.float64)[valid],
+                                        minlength=size)
+        self._memo.clear()
+        return self
+
+    def merge(self, other: "SegmentCube") -> "SegmentCube":
+        """Прибавляет куб с теми же измерениями и показателями."""
+        if (other.dimensions, other.measures) != (self.dimensions, self.measures):
+            raise ValueError("Объединять можно только кубы с одинаковыми измерениями.")
+        self.count += other.count
+        self.bad += other.bad
+        for m in self.measures:
+            self.sums[m] += other.sums[m]
+        self.skipped += other.skipped
+        self._memo.clear()
+        return self
+
+    def _rollup(self, values: np.ndarray, dims: Tuple[str, ...]) -> np.ndarray:
+        """Сумма по осям, не вошедшим в dims, с осями в порядке dims."""
+        cube = values.reshape(self.shape)
+        drop = tuple(i for i, d in enumerate(self.dimensions) if d not in dims)
+        kept = [d for d in self.dimensions if d in dims]
+        cube = cube.sum(axis=drop)
+        return np.transpose(cube, [kept.index(d) for d in dims]).ravel()
+
+    def query(self, dims: Iterable[str]) -> pd.DataFrame:
+        """
+        Срез по измерениям dims: count, bad, bad_rate и mean_<показатель>
+        для каждой непустой комбинации уровней. Повторный запрос отдаётся
+        из памяти; возвращаемый DataFrame общий, изменять его не следует.
+        """
+        dims = tuple(dims)
+        cached = self._memo.get(dims)
+        if cached is not None:
+            return cached
+        unknown = [d for d in dims if d not in self.dimensions]
+        if unknown or len(set(dims)) != len(dims):
+            raise ValueError(f"Срез {dims} не входит в измерения куба {self.dimensions}.")
+
+        count = self._rollup(self.count, dims)
+        columns = {"count": count, "bad": self._rollup(self.bad, dims)}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            columns["bad_rate"] = columns["bad"] / count
+            for m in self.measures:
+                columns[f"mean_{m}"] = self._rollup(self.sums[m], dims) / count
+
+        if not dims:
+            index = pd.Index(['всего'])
+        elif len(dims) == 1:
+            index = pd.Index(levels(dims[0]), name=dims[0])
+        else:
+            index = pd.MultiIndex.from_product([levels(d) for d in dims], names=dims)
+        frame = pd.DataFrame(columns, index=index)
+        frame = frame[frame["count"] > 0]
+        self._memo[dims] = frame
+        return frame
+
+def cube_for(slices: Iterable[Sequence[str]], measures: Sequence[str] = DEFAULT_MEASURES) -> SegmentCube:
+    """Пустой куб по DEFAULT_DIMENSIONS и всем измерениям, встречающимся в slices."""
+    dimensions = list(DEFAULT_DIMENSIONS)
+    for dims in slices:
+        dimensions.extend(d for d in dims if d not in dimensions)
+    return SegmentCube(dimensions, measures)
+
+def slice_all(cube: SegmentCube, slices: Iterable[Sequence[str]]) -> Dict[str, Any]:
+    """Результат этапа сегментов: куб и его срезы по slices."""
+    return {"cube": cube, "slices": {tuple(dims): cube.query(dims) for dims in slices}}
@@ -0,0 +1,151 @@
+"""
+Загрузка датасета German Credit с локальным кешем.
+
+Первая загрузка разбирает исходный файл с явными типами (категориальные
+признаки - category, числовые - малые целые) и сохраняет результат в кеш
+в колоночном формате (Parquet, если установлен pyarrow, иначе pickle).
+Кеш адресуется по содержимому: ключ - SHA-256 исходных байтов, а индекс
+источник -> хеш позволяет повторным запускам работать вообще без сети.
+"""
+import hashlib
+import io
+import json
+import os
+import urllib.request
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+URL = "https://archive.ics.uci.edu/ml/machine-learning-databases/statlog/german/german.data"
+
+COLUMNS = [
+    'checking_status', 'duration', 'credit_history', 'purpose', 'credit_amount',
+    'savings', 'employment', 'installment_rate', 'personal_status', 'other_debtors',
+    'residence_since', 'property', 'age', 'other_installment_plans', 'housing',
+    'existing_credits', 'job', 'people_liable', 'telephone', 'foreign_worker', 'credit_risk'
+]
+
+NUMERICAL_COLS = ['duration', 'credit_amount', 'installment_rate', 'residence_since', 'age',
+                  'existing_credits', 'people_liable']
+
+CATEGORICAL_COLS = ['checking_status', 'credit_history', 'purpose', 'savings', 'employment',
+                    'personal_status', 'other_debtors', 'property', 'other_installment_plans',
+                    'housing', 'job', 'telephone', 'foreign_worker']
+
+# Все уровни категориальных признаков по описанию датасета UCI. Нужны там,
+# где категории должны быть известны заранее (потоковая обработка по частям).
+CATEGORY_LEVELS = {
+    'checking_status': ['A11', 'A12', 'A13', 'A14'],
+    'credit_history': ['A30', 'A31', 'A32', 'A33', 'A34'],
+    'purpose': sorted(['A40', 'A41', 'A42', 'A43', 'A44', 'A45', 'A46', 'A47', 'A48', 'A49', 'A410']),
+    'savings': ['A61', 'A62', 'A63', 'A64', 'A65'],
+    'employment': ['A71', 'A72', 'A73', 'A74', 'A75'],
+    'personal_status': ['A91', 'A92', 'A93', 'A94', 'A95'],
+    'other_debtors': ['A101', 'A102', 'A103'],
+    'property': ['A121', 'A122', 'A123', 'A124'],
+    'other_installment_plans': ['A141', 'A142', 'A143'],
+    'housing': ['A151', 'A152', 'A153'],
+    'job': ['A171', 'A172', 'A173', 'A174'],
+    'telephone': ['A191', 'A192'],
+    'foreign_worker': ['A201', 'A202'],
+}
+
+DTYPES = {
+    **{col: 'category' for col in CATEGORICAL_COLS},
+    'duration': 'int16',
+    'credit_amount': 'int32',
+    'installment_rate': 'int8',
+    'residence_since': 'int8',
+    'age': 'int16',
+    'existing_credits': 'int8',
+    'people_liable': 'int8',
+    'credit_risk': 'int8',
+}
+
+CACHE_DIR = Path(os.environ.get("LAB3_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
+
+class DataLoadError(Exception):
+    pass
+
+def _read_source(source: str) -> bytes:
+    if source.startswith(("http://", "https://")):
+        with urllib.request.urlopen(source, timeout=30) as resp:
+            return resp.read()
+    with open(source, 'rb') as f:
+        return f.read()
+
+def _cache_file(cache_dir: Path, digest: str) -> Path:
+    try:
+        import pyarrow  # noqa: F401
+        return cache_dir / f"{digest}.parquet"
+    except ImportError:
+        return cache_dir / f"{digest}.pkl"
+
+def _read_cache(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+def _write_cache(df: pd.DataFrame, path: Path) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    if path.suffix == ".parquet":
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, path)
+
+def _load_index(cache_dir: Path) -> dict:
+    try:
+        return json.loads((cache_dir / "index.json").read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+def _save_index(cache_dir: Path, index: dict) -> None:
+    (cache_dir / "index.json").write_text(json.dumps(index, indent=1), encoding='utf-8')
+
+def parse_german_credit(raw: Union[bytes, str, Path]) -> pd.DataFrame:
+    """Разбор исходного формата (значения через пробел, без заголовка)."""
+    if isinstance(raw, bytes):
+        raw = io.BytesIO(raw)
+    return pd.read_csv(raw, sep=' ', header=None, names=COLUMNS, dtype=DTYPES)
+
+def load_german_credit(source: Optional[str] = None,
+                       cache_dir: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Возвращает DataFrame с данными German Credit.
+    source - URL или путь к локальному файлу (по умолчанию URL репозитория UCI).
+    Для URL, уже попавшего в кеш, сеть не используется; локальный файл
+    хешируется заново, так что изменённый файл не возьмётся из старого кеша.
+    """
+    source = str(source or URL)
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    index = _load_index(cache_dir)
+    is_url = source.startswith(("http://", "https://"))
+
+    if is_url and source in index:
+        cached = _cache_file(cache_dir, index[source])
+        if cached.exists():
+            return _read_cache(cached)
+
+    try:
+        raw = _read_source(source)
+    except OSError as e:
+        raise DataLoadError(f"Не удалось получить данные из {source}: {e}")
+
+    digest = hashlib.sha256(raw).hexdigest()
+    cached = _cache_file(cache_dir, digest)
+    if cached.exists():
+        df = _read_cache(cached)
+    else:
+        try:
+            df = parse_german_credit(raw)
+        except (ValueError, pd.errors.ParserError) as e:
+            raise DataLoadError(f"Ошибка разбора данных из {source}: {e}")
+        _write_cache(df, cached)
+
+    if is_url:
+        index[source] = digest
+        _save_index(cache_dir, index)
+    return df
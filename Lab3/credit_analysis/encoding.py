@@ -0,0 +1,57 @@
+"""
+Кодирование категориальных признаков в коды pandas category.
+"""
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+class CategoricalEncoder:
+    """
+    Замена набору LabelEncoder: для всех столбцов сразу хранит списки
+    категорий (в том же отсортированном порядке, что и LabelEncoder)
+    и переводит значения в компактные int8-коды без копирования всего
+    DataFrame. Сохранённое отображение применяется к новым данным без
+    повторного обучения; неизвестные значения получают код -1.
+    """
+
+    def __init__(self, columns: Iterable[str]):
+        self.columns = list(columns)
+        self.categories_: Dict[str, List[str]] = {}
+
+    @classmethod
+    def from_categories(cls, categories: Dict[str, List[str]]) -> "CategoricalEncoder":
+        """Энкодер с заранее известными категориями, без обучения на данных."""
+        encoder = cls(categories)
+        encoder.categories_ = {col: sorted(cats) for col, cats in categories.items()}
+        return encoder
+
+    def fit(self, df: pd.DataFrame) -> "CategoricalEncoder":
+        for col in self.columns:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                cats = values.cat.remove_unused_categories().cat.categories
+            else:
+                cats = pd.Index(values.dropna().unique())
+            self.categories_[col] = sorted(cats.tolist())
+        return self
+
+    def _codes(self, values: pd.Series, categories: List[str]) -> np.ndarray:
+        dtype = np.int8 if len(categories) < 128 else np.int16
+        return pd.Categorical(values, categories=categories).codes.astype(dtype, copy=False)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Коды для закодированных столбцов, имеющихся в df (только они, без остальных признаков)."""
+        return pd.DataFrame({col: self._codes(df[col], cats)
+                             for col, cats in self.categories_.items() if col in df},
+                            index=df.index)
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+    def inverse_transform(self, codes: pd.DataFrame) -> pd.DataFrame:
+        """Обратное преобразование кодов в исходные значения (код -1 -> NaN)."""
+        return pd.DataFrame({
+            col: pd.Categorical.from_codes(codes[col].to_numpy(), categories=cats)
+            for col, cats in self.categories_.items() if col in codes
+        }, index=codes.index)
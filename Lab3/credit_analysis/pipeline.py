@@ -0,0 +1,211 @@
+"""
+Запуск выбранных этапов с учётом зависимостей и печать отчётов.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from credit_analysis import stages
+from credit_analysis.cube import DEFAULT_SLICES
+
+STAGE_ORDER = ['load', 'variables', 'relations', 'plots', 'sql', 'segments']
+
+DEPENDENCIES = {
+    'load': [],
+    'variables': ['load'],
+    'relations': ['load', 'variables'],
+    'plots': ['load', 'variables'],
+    'sql': ['load'],
+    'segments': ['load'],
+}
+
+TITLES = {
+    'load': "Этап 1: Загрузка данных",
+    'variables': "Этап 2: Анализ переменных",
+    'relations': "Этап 3: Взаимосвязи и группировка",
+    'plots': "Этап 4: Построение графиков",
+    'sql': "Этап 5: Работа с SQL",
+    'segments': "Этап 6: Сегменты риска",
+}
+
+def _slices(slices: Optional[Sequence[Sequence[str]]]) -> Tuple[Tuple[str, ...], ...]:
+    return tuple(tuple(dims) for dims in slices) if slices else DEFAULT_SLICES
+
+def resolve(selected: Iterable[str]) -> List[str]:
+    """Выбранные этапы плюс их зависимости, в порядке выполнения."""
+    needed = set()
+    pending = list(selected)
+    while pending:
+        name = pending.pop()
+        if name not in DEPENDENCIES:
+            raise ValueError(f"Неизвестный этап: {name}")
+        if name not in needed:
+            needed.add(name)
+            pending.extend(DEPENDENCIES[name])
+    return [name for name in STAGE_ORDER if name in needed]
+
+def run(selected: Optional[Iterable[str]] = None, source: Optional[str] = None,
+        output: str = 'german_credit_analysis.png', show: bool = False,
+        db_path: Optional[str] = None, plot_dir: Optional[str] = None,
+        plot_format: str = 'png', slices: Optional[Sequence[Sequence[str]]] = None,
+        report: bool = True) -> Dict[str, Any]:
+    """
+    Выполняет этапы selected (по умолчанию все) и их зависимости.
+    Отчёты печатаются только для явно выбранных этапов.
+    db_path - файловая база SQLite, в которую дописываются новые данные.
+    plot_dir - безголовый режим графиков: отдельные файлы в этом каталоге,
+    каждый график в своём процессе, перерисовываются только изменившиеся.
+    slices - срезы этапа сегментов (кортежи измерений), по умолчанию DEFAULT_SLICES.
+    """
+    selected = list(selected or STAGE_ORDER)
+    results: Dict[str, Any] = {}
+
+    for name in resolve(selected):
+        if name == 'load':
+            results[name] = stages.load(source)
+        elif name == 'variables':
+            results[name] = stages.variables(results['load'])
+        elif name == 'relations':
+            results[name] = stages.relations(results['load'], results['variables']['encoded'])
+        elif name == 'plots':
+            if plot_dir:
+                from credit_analysis import plotting
+                results[name] = plotting.render_all(results['load'], results['variables']['encoded'],
+                                                    out_dir=plot_dir, fmt=plot_format)
+            else:
+                plots = stages.plots.__wrapped__ if show else stages.plots
+                results[name] = plots(results['load'], results['variables']['encoded'], output=output, show=show)
+        elif name == 'sql':
+            if db_path:
+                results[name] = stages.sql.__wrapped__(results['load'], db_path=db_path)
+            else:
+                results[name] = stages.sql(results['load'])
+        elif name == 'segments':
+            results[name] = stages.segments(results['load'], slices=_slices(slices))
+
+        if report and name in selected:
+            print(f"\n--- {TITLES[name]} ---")
+            REPORTS[name](results[name])
+
+    return results
+
+STREAMING_STAGES = ['load', 'variables', 'relations', 'sql', 'segments']
+
+def run_streaming(selected: Optional[Iterable[str]] = None, source: Optional[str] = None,
+                  chunksize: int = 100000, db_path: Optional[str] = None,
+                  from_db: Optional[str] = None, slices: Optional[Sequence[Sequence[str]]] = None,
+                  report: bool = True) -> Dict[str, Any]:
+    """
+    Потоковый режим: данные читаются частями (из файла или из SQLite from_db),
+    отчёты этапов 2, 3, 5 и 6 строятся за один проход без загрузки всего набора.
+    """
+    from credit_analysis import storage, streaming
+    from credit_analysis.cube import cube_for, slice_all
+
+    selected = list(selected or STREAMING_STAGES)
+    unsupported = [name for name in selected if name not in STREAMING_STAGES]
+    if unsupported:
+        raise ValueError(f"Этапы недоступны в потоковом режиме: {', '.join(unsupported)}")
+
+    if from_db:
+        chunks = streaming.iter_sqlite_chunks(from_db, chunksize)
+    else:
+        chunks = streaming.iter_csv_chunks(source, chunksize)
+
+    conn = storage.connect(db_path or ':memory:') if 'sql' in selected and not from_db else None
+    acc = streaming.StreamingReport()
+    cube = cube_for(_slices(slices)) if 'segments' in selected else None
+    inserted = 0
+    try:
+        for chunk in chunks:
+            acc.update(chunk)
+            if cube is not None:
+                cube.update(chunk)
+            if conn is not None:
+                inserted += storage.append_clients(conn, chunk)
+
+        results: Dict[str, Any] = {'load': acc.rows}
+        if 'variables' in selected:
+            results['variables'] = acc.variables()
+        if 'relations' in selected:
+            results['relations'] = acc.relations()
+        if cube is not None:
+            results['segments'] = slice_all(cube, _slices(slices))
+        if 'sql' in selected:
+            if conn is None:
+                conn = storage.connect(from_db)
+            results['sql'] = storage.report(conn)
+            results['sql']['inserted'] = inserted
+            results['sql']['total'] = conn.execute("SELECT COUNT(*) FROM clients;").fetchone()[0]
+    finally:
+        if conn is not None:
+            conn.close()
+
+    if report:
+        for name in STREAMING_STAGES:
+            if name not in selected:
+                continue
+            print(f"\n--- {TITLES[name]} ---")
+            if name == 'load':
+                print(f"Прочитано строк (потоково): {results['load']}")
+            else:
+                REPORTS[name](results[name])
+    return results
+
+def report_load(df):
+    print("Данные успешно загружены.")
+    # Проверка на пропущенные значения
+    print("\nПропущенные значения в столбцах:")
+    print(df.isnull().sum())
+    print(f"\nРазмер датасета: {df.shape}")
+    print(df.head())
+
+def report_variables(result):
+    print("\nСтатистика числовых признаков:")
+    print(result['describe'])
+    print("\nУникальные значения категориальных признаков (топ-3):")
+    for col, (values, count) in result['uniques'].items():
+        print(f"{col}: {values}... (Всего уникальных: {count})")
+    print("\nКатегориальные признаки закодированы в числовой формат.")
+
+def report_relations(result):
+    print("\nСредние показатели по статусу кредита:")
+    print(result['grouped_risk'])
+    if 'grouped_purpose' in result:
+        print("\nСредний кредит по целям (топ-5 категорий):")
+        print(result['grouped_purpose'].head())
+
+def report_plots(path):
+    if isinstance(path, dict):
+        for file in path.values():
+            print(f"График сохранён в файл '{file}'")
+    else:
+        print(f"Графики сохранены в файл '{path}'")
+
+def report_sql(result):
+    print(f"Данные успешно экспортированы в SQLite "
+          f"(добавлено строк: {result['inserted']}, всего: {result['total']}).")
+    print("\nSQL 1: Топ-5 самых больших кредитов:")
+    for row in result['top_credits']:
+        print(row)
+    print("\nSQL 2: Средний кредит по типу жилья:")
+    for row in result['housing']:
+        print(f"Жилье: {row[0]}, Средний кредит: {row[1]:.2f}, Кол-во: {row[2]}")
+    print("\nSQL 3: Рискованные заемщики старше 50 лет (примеры):")
+    for row in result['risky_seniors']:
+        print(row)
+
+def report_segments(result):
+    cube = result['cube']
+    if cube.skipped:
+        print(f"Пропущено строк с неизвестными значениями измерений: {cube.skipped}")
+    for dims, frame in result['slices'].items():
+        print(f"\nДоля плохих кредитов по {' x '.join(dims)} (топ-15 по bad_rate):")
+        print(frame.sort_values('bad_rate', ascending=False).head(15).to_string(float_format='{:.2f}'.format))
+
+REPORTS = {
+    'load': report_load,
+    'variables': report_variables,
+    'relations': report_relations,
+    'plots': report_plots,
+    'sql': report_sql,
+    'segments': report_segments,
+}
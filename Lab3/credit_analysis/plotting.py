@@ -0,0 +1,144 @@
+"""
+Безголовая (headless) отрисовка графиков этапа 4.
+
+Данные для каждого графика заранее агрегируются в основном процессе
+(гистограмма с KDE по корзинам, статистики boxplot, матрица корреляций,
+частоты целей), поэтому объём входа не зависит от размера датасета.
+Каждый график рисуется в отдельном процессе с backend Agg и сохраняется
+в свой файл (PNG или SVG). В manifest.json хранится хеш входа каждого
+графика: перерисовываются только графики, чьи данные изменились.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from credit_analysis.cache import CACHE_VERSION, fingerprint
+from credit_analysis.data import NUMERICAL_COLS
+
+MANIFEST = "manifest.json"
+
+def _binned_kde(values: np.ndarray, grid_size: int = 512) -> Dict[str, np.ndarray]:
+    """Гауссова KDE (ширина окна по Скотту), посчитанная сверткой по корзинам."""
+    n = len(values)
+    bw = values.std(ddof=1) * n ** (-1 / 5) if n > 1 else 1.0
+    bw = bw or 1.0
+    lo, hi = values.min() - 3 * bw, values.max() + 3 * bw
+    counts, edges = np.histogram(values, bins=grid_size, range=(lo, hi))
+    step = edges[1] - edges[0]
+    half = int(np.ceil(4 * bw / step))
+    offsets = np.arange(-half, half + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2) / (bw * np.sqrt(2 * np.pi))
+    density = np.convolve(counts, kernel, mode='same') / n
+    return {"x": (edges[:-1] + edges[1:]) / 2, "density": density}
+
+def _box_stats(values: np.ndarray, label: str) -> Dict[str, Any]:
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        "label": label, "q1": q1, "med": med, "q3": q3,
+        "whislo": inside.min(), "whishi": inside.max(),
+        "fliers": values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)],
+    }
+
+def chart_inputs(df: pd.DataFrame, df_encoded: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Предагрегированные входы для четырёх графиков."""
+    age = df['age'].to_numpy(dtype=np.float64)
+    counts, edges = np.histogram(age, bins=20)
+    kde = _binned_kde(age)
+    # KDE в масштабе количества, как у seaborn.histplot(kde=True)
+    kde["density"] = kde["density"] * len(age) * (edges[1] - edges[0])
+
+    labels = pd.unique(df['credit_risk_label'])
+    amounts = df['credit_amount'].to_numpy(dtype=np.float64)
+    risk = df['credit_risk_label'].to_numpy()
+
+    return {
+        "age_hist": {"counts": counts, "edges": edges, "kde": kde},
+        "credit_box": {"stats": [_box_stats(amounts[risk == label], label) for label in labels]},
+        "corr_heatmap": {"corr": df_encoded[NUMERICAL_COLS + ['credit_risk']].corr()},
+        "purpose_counts": {"counts": df['purpose'].value_counts()},
+    }
+
+def render_chart(name: str, data: Dict[str, Any], path: str) -> str:
+    """Рисует один график в файл path. Выполняется в отдельном процессе."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("whitegrid")
+    fig, ax = plt.subplots(figsize=(9, 6))
+
+    if name == "age_hist":
+        edges = data["edges"]
+        ax.bar(edges[:-1], data["counts"], width=np.diff(edges), align='edge',
+               color='skyblue', edgecolor='white', alpha=0.75)
+        ax.plot(data["kde"]["x"], data["kde"]["density"], color='skyblue')
+        ax.set_title('Распределение возраста клиентов')
+        ax.set_xlabel('Возраст')
+        ax.set_ylabel('Количество')
+    elif name == "credit_box":
+        stats = data["stats"]
+        box = ax.bxp(stats, showfliers=True, patch_artist=True, medianprops={'color': 'black'})
+        for patch, color in zip(box['boxes'], sns.color_palette("Set2", len(stats))):
+            patch.set_facecolor(color)
+        ax.set_title('Распределение суммы кредита по статусу риска')
+        ax.set_xlabel('Статус кредита (Good/Bad)')
+        ax.set_ylabel('Сумма кредита (DM)')
+    elif name == "corr_heatmap":
+        sns.heatmap(data["corr"], annot=True, cmap='coolwarm', fmt=".2f", linewidths=.5, ax=ax)
+        ax.set_title('Корреляция числовых признаков')
+    elif name == "purpose_counts":
+        counts = data["counts"]
+        ax.bar(counts.index.astype(str), counts.to_numpy(),
+               color=sns.color_palette('viridis', len(counts)))
+        ax.set_title('Количество кредитов по целям')
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.set_xlabel('Код цели (A40-A410)')
+    else:
+        raise ValueError(f"Неизвестный график: {name}")
+
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+def _load_manifest(out_dir: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def render_all(df: pd.DataFrame, df_encoded: pd.DataFrame, out_dir: str = "charts",
+               fmt: str = "png", max_workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Рисует графики в out_dir/<имя>.<fmt>, каждый в своём процессе.
+    Возвращает пути ко всем графикам; неизменённые графики не перерисовываются.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = _load_manifest(out_dir)
+    inputs = chart_inputs(df, df_encoded)
+
+    paths, pending = {}, {}
+    for name, data in inputs.items():
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        key = fingerprint({"data": fingerprint(data), "fmt": fmt, "version": CACHE_VERSION})
+        paths[name] = path
+        if manifest.get(os.path.basename(path)) != key or not os.path.exists(path):
+            pending[name] = key
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=max_workers or min(len(pending), os.cpu_count() or 1)) as pool:
+            futures = {name: pool.submit(render_chart, name, inputs[name], paths[name]) for name in pending}
+            for name, future in futures.items():
+                future.result()
+                manifest[os.path.basename(paths[name])] = pending[name]
+        with open(os.path.join(out_dir, MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+    return paths
@@ -0,0 +1,127 @@
+"""
+Этапы анализа. Каждая функция получает всё нужное аргументами
+и возвращает результат, ничего не печатая (вывод - в pipeline).
+"""
+import os
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from credit_analysis import storage
+from credit_analysis.cache import cached_stage
+from credit_analysis.cube import DEFAULT_SLICES, cube_for, slice_all
+from credit_analysis.data import NUMERICAL_COLS, CATEGORICAL_COLS, load_german_credit
+from credit_analysis.encoding import CategoricalEncoder
+
+def load(source: Optional[str] = None) -> pd.DataFrame:
+    """Этап 1: загрузка данных (кешируется в credit_analysis.data) и метка риска."""
+    df = load_german_credit(source)
+    # Интерпретация целевой переменной
+    df['credit_risk_label'] = df['credit_risk'].map({1: 'Good', 2: 'Bad'})
+    return df
+
+@cached_stage
+def variables(df: pd.DataFrame) -> Dict[str, Any]:
+    """Этап 2: описательная статистика и кодирование категориальных признаков."""
+    # Списком: у категориального столбца unique() печатается вместе с блоком Categories (...)
+    uniques = {col: (df[col].unique()[:3].tolist(), df[col].nunique()) for col in CATEGORICAL_COLS}
+
+    # Кодирование категориальных признаков для анализа корреляций:
+    # в кадр попадают только нужные столбцы, категориальные - как int8-коды
+    encoder = CategoricalEncoder(CATEGORICAL_COLS).fit(df)
+    df_encoded = pd.concat([df[NUMERICAL_COLS], encoder.transform(df), df[['credit_risk']]], axis=1)
+
+    return {
+        "describe": df[NUMERICAL_COLS].describe(),
+        "uniques": uniques,
+        "encoded": df_encoded,
+        "encoder": encoder,
+    }
+
+@cached_stage
+def relations(df: pd.DataFrame, df_encoded: pd.DataFrame) -> Dict[str, Any]:
+    """Этап 3: корреляционная матрица и группировки."""
+    cols_for_corr = NUMERICAL_COLS + CATEGORICAL_COLS + ['credit_risk']
+    return {
+        "correlation": df_encoded[cols_for_corr].corr(),
+        "grouped_risk": df.groupby('credit_risk_label', observed=True)[['credit_amount', 'age']].mean(),
+        "grouped_purpose": df.groupby('purpose', observed=True)['credit_amount'].mean().sort_values(ascending=False),
+    }
+
+@cached_stage(valid=os.path.exists)
+def plots(df: pd.DataFrame, df_encoded: pd.DataFrame,
+          output: str = 'german_credit_analysis.png', show: bool = False) -> str:
+    """
+    Этап 4: графики, сохраняются в файл output. Возвращает путь к файлу.
+    show=True дополнительно открывает окно (используйте plots.__wrapped__, чтобы обойти кеш).
+    """
+    import matplotlib
+    if not show:
+        # Без окна рисуем через Agg: не нужен дисплей и ничего не блокируется
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Настройка стиля
+    sns.set_style("whitegrid")
+    fig = plt.figure(figsize=(18, 12))
+
+    # График 1: Гистограмма распределения возраста
+    plt.subplot(2, 2, 1)
+    sns.histplot(data=df, x='age', bins=20, kde=True, color='skyblue')
+    plt.title('Распределение возраста клиентов')
+    plt.xlabel('Возраст')
+    plt.ylabel('Количество')
+
+    # График 2: Boxplot суммы кредита в зависимости от риска
+    plt.subplot(2, 2, 2)
+    sns.boxplot(x='credit_risk_label', y='credit_amount', data=df, palette="Set2")
+    plt.title('Распределение суммы кредита по статусу риска')
+    plt.xlabel('Статус кредита (Good/Bad)')
+    plt.ylabel('Сумма кредита (DM)')
+
+    # График 3: Тепловая карта корреляции
+    plt.subplot(2, 2, 3)
+    subset_corr = df_encoded[NUMERICAL_COLS + ['credit_risk']].corr()
+    sns.heatmap(subset_corr, annot=True, cmap='coolwarm', fmt=".2f", linewidths=.5)
+    plt.title('Корреляция числовых признаков')
+
+    # График 4: Столбчатая диаграмма целей кредита
+    plt.subplot(2, 2, 4)
+    sns.countplot(x='purpose', data=df, order=df['purpose'].value_counts().index, palette='viridis')
+    plt.title('Количество кредитов по целям')
+    plt.xticks(rotation=45)
+    plt.xlabel('Код цели (A40-A410)')
+
+    plt.tight_layout()
+    plt.savefig(output)
+    if show:
+        plt.show()
+    plt.close(fig)
+    return output
+
+@cached_stage
+def sql(df: pd.DataFrame, db_path: str = ':memory:') -> Dict[str, Any]:
+    """
+    Этап 5: экспорт в SQLite и три отчётных запроса.
+    С файловой базой (db_path) данные накапливаются между запусками,
+    поэтому такой вызов нужно делать через sql.__wrapped__, минуя кеш.
+    """
+    conn = storage.connect(db_path)
+    try:
+        inserted = storage.append_clients(conn, df)
+        result = storage.report(conn)
+        result["inserted"] = inserted
+        result["total"] = conn.execute("SELECT COUNT(*) FROM clients;").fetchone()[0]
+        return result
+    finally:
+        conn.close()
+
+@cached_stage
+def segments(df: pd.DataFrame, slices: Tuple[Sequence[str], ...] = DEFAULT_SLICES) -> Dict[str, Any]:
+    """
+    Этап 6: сегменты риска. Куб count / bad / средних строится одним
+    векторным проходом, срезы slices - суммированием куба по осям.
+    Результат содержит и сам куб: новые срезы из него не требуют данных.
+    """
+    return slice_all(cube_for(slices).update(df), slices)
@@ -0,0 +1,127 @@
+"""
+SQLite-хранилище клиентов для отчётных SQL-запросов.
+
+Вставка идёт пачками через executemany в одной транзакции, для файловой
+базы включается WAL. Индексы соответствуют трём отчётным запросам, поэтому
+отчёты не сканируют всю таблицу по мере её роста. Уже загруженные пачки
+запоминаются по хешу содержимого и повторно не вставляются.
+"""
+import sqlite3
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from credit_analysis.cache import fingerprint
+
+SQL_COLUMNS = {
+    'age': 'age',
+    'personal_status': 'gender_status',
+    'job': 'job_type',
+    'housing': 'housing',
+    'savings': 'saving_accounts',
+    'checking_status': 'checking_account',
+    'credit_amount': 'credit_amount',
+    'duration': 'duration',
+    'purpose': 'purpose',
+    'credit_risk': 'risk',
+}
+
+CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS clients (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    age INTEGER,
+    gender_status TEXT,
+    job_type TEXT,
+    housing TEXT,
+    saving_accounts TEXT,
+    checking_account TEXT,
+    credit_amount INTEGER,
+    duration INTEGER,
+    purpose TEXT,
+    risk INTEGER
+);
+"""
+
+CREATE_INDEX_QUERIES = [
+    # Запрос 1: ORDER BY credit_amount DESC LIMIT 5
+    "CREATE INDEX IF NOT EXISTS idx_clients_credit_amount ON clients (credit_amount DESC);",
+    # Запрос 2: GROUP BY housing с AVG(credit_amount) - покрывающий индекс
+    "CREATE INDEX IF NOT EXISTS idx_clients_housing ON clients (housing, credit_amount);",
+    # Запрос 3: WHERE risk = 2 AND age > 50
+    "CREATE INDEX IF NOT EXISTS idx_clients_risk_age ON clients (risk, age);",
+]
+
+CREATE_BATCHES_QUERY = """
+CREATE TABLE IF NOT EXISTS loaded_batches (
+    digest TEXT PRIMARY KEY,
+    rows INTEGER
+);
+"""
+
+INSERT_QUERY = (f"INSERT INTO clients ({', '.join(SQL_COLUMNS.values())}) "
+                f"VALUES ({', '.join('?' * len(SQL_COLUMNS))});")
+
+# SQL Запрос 1: Выборка топ-5 самых больших кредитов
+QUERY_TOP_CREDITS = """
+SELECT age, purpose, credit_amount, risk 
+FROM clients 
+ORDER BY credit_amount DESC 
+LIMIT 5;
+"""
+
+# SQL Запрос 2: Агрегация - Средний кредит по типу жилья
+QUERY_HOUSING = """
+SELECT housing, AVG(credit_amount) as avg_credit, COUNT(*) as count
+FROM clients 
+GROUP BY housing;
+"""
+
+# SQL Запрос 3: Выборка "Плохих" заемщиков старше 50 лет
+QUERY_RISKY_SENIORS = """
+SELECT age, credit_amount, purpose 
+FROM clients 
+WHERE risk = 2 AND age > 50 
+LIMIT 3;
+"""
+
+def connect(path: str = ':memory:') -> sqlite3.Connection:
+    """Открывает базу, включает WAL (для файла) и создаёт схему с индексами."""
+    conn = sqlite3.connect(path)
+    if path != ':memory:':
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-65536;")  # 64 МБ
+    with conn:
+        conn.execute(CREATE_TABLE_QUERY)
+        conn.execute(CREATE_BATCHES_QUERY)
+        for query in CREATE_INDEX_QUERIES:
+            conn.execute(query)
+    return conn
+
+def _rows(df: pd.DataFrame, batch_size: int) -> Iterator[List[Tuple]]:
+    # tolist() возвращает обычные типы Python, которые понимает sqlite3
+    for start in range(0, len(df), batch_size):
+        chunk = df.iloc[start:start + batch_size]
+        yield list(zip(*(chunk[col].tolist() for col in SQL_COLUMNS)))
+
+def append_clients(conn: sqlite3.Connection, df: pd.DataFrame, batch_size: int = 50000) -> int:
+    """
+    Добавляет клиентов из df одной транзакцией. Пачка с уже загруженным
+    содержимым пропускается. Возвращает число вставленных строк.
+    """
+    digest = fingerprint(df[list(SQL_COLUMNS)])
+    with conn:
+        if conn.execute("SELECT 1 FROM loaded_batches WHERE digest = ?;", (digest,)).fetchone():
+            return 0
+        for rows in _rows(df, batch_size):
+            conn.executemany(INSERT_QUERY, rows)
+        conn.execute("INSERT INTO loaded_batches (digest, rows) VALUES (?, ?);", (digest, len(df)))
+    return len(df)
+
+def report(conn: sqlite3.Connection) -> Dict[str, list]:
+    return {
+        "top_credits": conn.execute(QUERY_TOP_CREDITS).fetchall(),
+        "housing": conn.execute(QUERY_HOUSING).fetchall(),
+        "risky_seniors": conn.execute(QUERY_RISKY_SENIORS).fetchall(),
+    }
@@ -0,0 +1,262 @@
+"""
+Потоковый (out-of-core) режим анализа: данные читаются частями, а отчёты
+строятся по объединяемым (mergeable) накопителям за один проход.
+
+- Moments: количество, среднее, min/max и матрица ко-моментов
+  (дисперсии и корреляции) с параллельным слиянием по формулам Чана;
+- QuantileSketch: гистограмма с ограниченным числом корзин для
+  приближённых квартилей (для целых значений точна, пока корзин хватает);
+- суммы и количества по группам и частоты категорий.
+
+Накопители с разных частей (или процессов) объединяются методом merge.
+"""
+import sqlite3
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from credit_analysis.data import (COLUMNS, DTYPES, NUMERICAL_COLS, CATEGORICAL_COLS,
+                                  CATEGORY_LEVELS, URL)
+from credit_analysis.encoding import CategoricalEncoder
+from credit_analysis.storage import SQL_COLUMNS
+
+def iter_csv_chunks(source: Optional[str] = None, chunksize: int = 100000) -> Iterator[pd.DataFrame]:
+    """Читает исходный файл (или URL) частями по chunksize строк."""
+    yield from pd.read_csv(source or URL, sep=' ', header=None, names=COLUMNS,
+                           dtype=DTYPES, chunksize=chunksize)
+
+def iter_sqlite_chunks(db_path: str, chunksize: int = 100000) -> Iterator[pd.DataFrame]:
+    """Читает таблицу clients частями; столбцы переименовываются обратно в исходные."""
+    back = {sql_name: name for name, sql_name in SQL_COLUMNS.items()}
+    conn = sqlite3.connect(db_path)
+    try:
+        query = f"SELECT {', '.join(back)} FROM clients ORDER BY id;"
+        for chunk in pd.read_sql_query(query, conn, chunksize=chunksize):
+            yield chunk.rename(columns=back)
+    finally:
+        conn.close()
+
+class Moments:
+    """Количество, средние, min/max и ко-моменты для набора столбцов."""
+
+    def __init__(self, columns: List[str]):
+        k = len(columns)
+        self.columns = list(columns)
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+
+    def update(self, x: np.ndarray) -> None:
+        if len(x) == 0:
+            return
+        mean = x.mean(axis=0)
+        d = x - mean
+        self._combine(len(x), mean, d.T @ d, x.min(axis=0), x.max(axis=0))
+
+    def merge(self, other: "Moments") -> None:
+        self._combine(other.n, other.mean, other.comoment, other.min, other.max)
+
+    def _combine(self, m, mean, comoment, mn, mx) -> None:
+        if m == 0:
+            return
+        total = self.n + m
+        delta = mean - self.mean
+        self.comoment += comoment + np.outer(delta, delta) * (self.n * m / total)
+        self.mean += delta * (m / total)
+        self.n = total
+        np.minimum(self.min, mn, out=self.min)
+        np.maximum(self.max, mx, out=self.max)
+
+    def std(self) -> np.ndarray:
+        if self.n < 2:
+            return np.full(len(self.columns), np.nan)
+        return np.sqrt(np.diag(self.comoment) / (self.n - 1))
+
+    def corr(self) -> pd.DataFrame:
+        scale = np.sqrt(np.diag(self.comoment))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.comoment / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+class QuantileSketch:
+    """
+    Гистограмма с корзинами ширины width. Если корзин становится больше
+    max_bins, ширина удваивается и соседние корзины сливаются, так что
+    память ограничена, а ошибка квантиля не превышает ширины корзины.
+    """
+
+    def __init__(self, max_bins: int = 4096, width: float = 1.0):
+        self.max_bins = max_bins
+        self.width = width
+        self.counts: Counter = Counter()
+
+    def update(self, values: np.ndarray) -> None:
+        keys, counts = np.unique(np.floor(values / self.width).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.counts[key] += count
+        while len(self.counts) > self.max_bins:
+            self._coarsen()
+
+    def _coarsen(self) -> None:
+        self.counts = _halve(self.counts)
+        self.width *= 2
+
+    def merge(self, other: "QuantileSketch") -> None:
+        other_counts, other_width = other.counts, other.width
+        while other_width < self.width:
+            other_counts = _halve(other_counts)
+            other_width *= 2
+        while self.width < other_width:
+            self._coarsen()
+        self.counts.update(other_counts)
+        while len(self.counts) > self.max_bins:
+            self._coarsen()
+
+    def quantile(self, q: float) -> float:
+        """Квантиль с линейной интерполяцией между порядковыми статистиками, как в pandas."""
+        if not self.counts:
+            return np.nan
+        keys = np.array(sorted(self.counts))
+        cum = np.cumsum([self.counts[k] for k in keys])
+        values = keys * self.width + (self.width / 2 if self.width > 1 else 0)
+        pos = q * (cum[-1] - 1)
+        lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+        v_lo = values[np.searchsorted(cum, lo, side='right')]
+        v_hi = values[np.searchsorted(cum, hi, side='right')]
+        return float(v_lo + (v_hi - v_lo) * (pos - lo))
+
+def _halve(counts: Counter) -> Counter:
+    merged: Counter = Counter()
+    for key, count in counts.items():
+        merged[key // 2] += count
+    return merged
+
+class StreamingReport:
+    """
+    Накопитель отчётов этапов 2-3 по частям данных.
+    Категориальные признаки кодируются по заранее известным уровням
+    (CATEGORY_LEVELS), чтобы коды совпадали во всех частях.
+    """
+
+    def __init__(self, encoder: Optional[CategoricalEncoder] = None):
+        self.encoder = encoder or CategoricalEncoder.from_categories(CATEGORY_LEVELS)
+        self.rows = 0
+        self.numerical: List[str] = []
+        self.categorical: List[str] = []
+        self.moments: Optional[Moments] = None
+        self.sketches: Dict[str, QuantileSketch] = {}
+        self.value_counts: Dict[str, Counter] = {}
+        self.group_sums: Dict[str, Dict] = {}
+
+    def _init_columns(self, chunk: pd.DataFrame) -> None:
+        self.numerical = [c for c in NUMERICAL_COLS if c in chunk]
+        self.categorical = [c for c in CATEGORICAL_COLS if c in chunk]
+        self.moments = Moments(self.numerical + self.categorical + ['credit_risk'])
+        self.sketches = {c: QuantileSketch() for c in self.numerical}
+        self.value_counts = {c: Counter() for c in self.categorical}
+        self.group_sums = {'credit_risk': {}, 'purpose': {}}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if self.moments is None:
+            self._init_columns(chunk)
+        self.rows += len(chunk)
+
+        codes = self.encoder.transform(chunk[self.categorical])
+        matrix = np.column_stack([chunk[self.numerical].to_numpy(dtype=np.float64),
+                                  codes[self.categorical].to_numpy(dtype=np.float64),
+                                  chunk['credit_risk'].to_numpy(dtype=np.float64)])
+        self.moments.update(matrix)
+
+        for col in self.numerical:
+            self.sketches[col].update(chunk[col].to_numpy(dtype=np.float64))
+        for col in self.categorical:
+            counts = self.value_counts[col]
+            for value in chunk[col].unique():  # порядок первого появления, как у unique()
+                counts.setdefault(value, 0)
+            counts.update(chunk[col].value_counts().to_dict())
+
+        self._update_groups('credit_risk', chunk, ['credit_amount', 'age'])
+        if 'purpose' in chunk:
+            self._update_groups('purpose', chunk, ['credit_amount'])
+
+    def _update_groups(self, by: str, chunk: pd.DataFrame, cols: List[str]) -> None:
+        grouped = chunk.groupby(by, observed=True)[cols]
+        sums, counts = grouped.sum(), grouped.size()
+        acc = self.group_sums[by]
+        for key, count in counts.items():
+            total = acc.setdefault(key, [0, np.zeros(len(cols))])
+            total[0] += count
+            total[1] += sums.loc[key].to_numpy(dtype=np.float64)
+
+    def merge(self, other: "StreamingReport") -> None:
+        if other.moments is None:
+            return
+        if self.moments is None:
+            self.__dict__.update(other.__dict__)
+            return
+        self.rows += other.rows
+        self.moments.merge(other.moments)
+        for col, sketch in other.sketches.items():
+            self.sketches[col].merge(sketch)
+        for col, counts in other.value_counts.items():
+            for value, count in counts.items():
+                self.value_counts[col][value] = self.value_counts[col].get(value, 0) + count
+        for by, groups in other.group_sums.items():
+            acc = self.group_sums[by]
+            for key, (count, sums) in groups.items():
+                total = acc.setdefault(key, [0, np.zeros(len(sums))])
+                total[0] += count
+                total[1] += sums
+
+    def describe(self) -> pd.DataFrame:
+        k = len(self.numerical)
+        m = self.moments
+        rows = {
+            'count': np.full(k, float(m.n)),
+            'mean': m.mean[:k],
+            'std': m.std()[:k],
+            'min': m.min[:k],
+            '25%': [self.sketches[c].quantile(0.25) for c in self.numerical],
+            '50%': [self.sketches[c].quantile(0.50) for c in self.numerical],
+            '75%': [self.sketches[c].quantile(0.75) for c in self.numerical],
+            'max': m.max[:k],
+        }
+        return pd.DataFrame(rows, index=self.numerical).T
+
+    def variables(self) -> Dict[str, object]:
+        """Результат в формате этапа stages.variables (без закодированного кадра)."""
+        return {
+            "describe": self.describe(),
+            "uniques": {col: (list(counts)[:3], len(counts))
+                        for col, counts in self.value_counts.items()},
+            "encoder": self.encoder,
+        }
+
+    def _group_means(self, by: str, cols: List[str]) -> pd.DataFrame:
+        groups = self.group_sums[by]
+        keys = list(groups)
+        means = np.array([groups[k][1] / groups[k][0] for k in keys])
+        return pd.DataFrame(means, index=pd.Index(keys, name=by), columns=cols)
+
+    def relations(self) -> Dict[str, object]:
+        """Результат в формате этапа stages.relations."""
+        risk = self._group_means('credit_risk', ['credit_amount', 'age'])
+        risk.index = risk.index.map({1: 'Good', 2: 'Bad'}).rename('credit_risk_label')
+        result = {
+            "correlation": self.moments.corr(),
+            "grouped_risk": risk.sort_index(),
+        }
+        if self.group_sums['purpose']:
+            purpose = self._group_means('purpose', ['credit_amount'])['credit_amount']
+            result["grouped_purpose"] = purpose.sort_values(ascending=False)
+        return result
+
+def analyze(chunks: Iterable[pd.DataFrame]) -> StreamingReport:
+    report = StreamingReport()
+    for chunk in chunks:
+        report.update(chunk)
+    return report
@@ -0,0 +1,41 @@
+"""
+Синтетические данные в схеме German Credit (для бенчмарков и работы без сети).
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from credit_analysis.data import COLUMNS, DTYPES, CATEGORY_LEVELS
+
+# Диапазоны числовых признаков как в исходном датасете
+NUMERIC_RANGES = {
+    'duration': (4, 72),
+    'credit_amount': (250, 18424),
+    'installment_rate': (1, 4),
+    'residence_since': (1, 4),
+    'age': (19, 75),
+    'existing_credits': (1, 4),
+    'people_liable': (1, 2),
+}
+
+def synthetic_credit(rows: int, seed: int = 42, bad_rate: float = 0.3) -> pd.DataFrame:
+    """DataFrame из rows случайных заявок с теми же столбцами и типами, что у load_german_credit."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in COLUMNS:
+        if col in CATEGORY_LEVELS:
+            levels = CATEGORY_LEVELS[col]
+            data[col] = pd.Categorical.from_codes(rng.integers(0, len(levels), rows), categories=levels)
+        elif col in NUMERIC_RANGES:
+            lo, hi = NUMERIC_RANGES[col]
+            data[col] = rng.integers(lo, hi + 1, rows).astype(DTYPES[col])
+        else:  # credit_risk: 1 - хороший, 2 - плохой
+            data[col] = np.where(rng.random(rows) < bad_rate, 2, 1).astype(DTYPES[col])
+    return pd.DataFrame(data, columns=COLUMNS)
+
+def write_german_data(filename: str, rows: int, seed: int = 42, df: Optional[pd.DataFrame] = None) -> None:
+    """Записывает данные в исходном формате german.data (через пробел, без заголовка)."""
+    if df is None:
+        df = synthetic_credit(rows, seed)
+    df.to_csv(filename, sep=' ', header=False, index=False)
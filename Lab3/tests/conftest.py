@@ -0,0 +1,12 @@
+import pytest
+from credit_analysis.synthetic import synthetic_credit
+
+@pytest.fixture
+def credit_df():
+    return synthetic_credit(3000, seed=7)
+
+@pytest.fixture
+def stage_cache(tmp_path, monkeypatch):
+    from credit_analysis import cache
+    monkeypatch.setattr(cache, "STAGE_CACHE_DIR", tmp_path / "stages")
+    return tmp_path / "stages"
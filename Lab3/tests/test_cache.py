@@ -0,0 +1,36 @@
+from credit_analysis.cache import cached_stage, fingerprint
+
+def test_cached_stage_hit_and_miss(credit_df, stage_cache):
+    calls = []
+
+    @cached_stage
+    def rows(df, limit=10):
+        calls.append(len(df))
+        return {"rows": min(len(df), limit)}
+
+    assert rows(credit_df) == {"rows": 10}
+    assert rows(credit_df.copy()) == {"rows": 10}
+    assert len(calls) == 1
+    assert len(list(stage_cache.glob("rows-*.pkl"))) == 1
+
+    rows(credit_df, limit=5)
+    rows(credit_df.iloc[:-1])
+    assert len(calls) == 3
+
+def test_cached_stage_recomputes_invalid_result(credit_df, stage_cache):
+    calls = []
+
+    @cached_stage(valid=lambda result: result != "stale")
+    def stage(df):
+        calls.append(1)
+        return "stale"
+
+    stage(credit_df)
+    stage(credit_df)
+    assert len(calls) == 2
+
+def test_fingerprint_depends_on_content(credit_df):
+    changed = credit_df.copy()
+    changed.iloc[0, changed.columns.get_loc("age")] += 1
+    assert fingerprint(credit_df) == fingerprint(credit_df.copy())
+    assert fingerprint(credit_df) != fingerprint(changed)
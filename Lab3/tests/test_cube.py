@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from credit_analysis.cube import AGE_BINS, AGE_LABELS, SegmentCube, levels
+
+def expected_slice(df, dims):
+    df = df.assign(age_bucket=pd.Categorical.from_codes(
+        np.searchsorted(AGE_BINS, df['age'], side='right') - 1, AGE_LABELS),
+        bad=(df['credit_risk'] == 2).astype(np.int64))
+    return df.groupby(list(dims), observed=True).agg(
+        count=('bad', 'size'), bad=('bad', 'sum'),
+        mean_credit_amount=('credit_amount', 'mean'), mean_duration=('duration', 'mean'))
+
+@pytest.mark.parametrize("dims", [("purpose",), ("housing", "age_bucket"), ("age_bucket", "savings")])
+def test_cube_slices_match_groupby(credit_df, dims):
+    cube = SegmentCube().update(credit_df)
+    got = cube.query(dims)
+    want = expected_slice(credit_df, dims)
+
+    assert got.index.names == list(dims)
+    assert list(got.index) == list(want.index)
+    assert got["count"].tolist() == want["count"].tolist()
+    assert got["bad"].tolist() == want["bad"].tolist()
+    assert np.allclose(got["bad_rate"], want["bad"] / want["count"])
+    assert np.allclose(got["mean_credit_amount"], want["mean_credit_amount"])
+    assert np.allclose(got["mean_duration"], want["mean_duration"])
+    assert cube.query(dims) is got
+
+def test_cube_merge_and_unknown_levels(credit_df):
+    whole = SegmentCube().update(credit_df)
+    merged = SegmentCube().update(credit_df.iloc[:1000]).merge(SegmentCube().update(credit_df.iloc[1000:]))
+    pd.testing.assert_frame_equal(merged.query(("housing", "purpose")), whole.query(("housing", "purpose")))
+
+    odd = credit_df.iloc[:10].astype({"purpose": object})
+    odd.iloc[0, odd.columns.get_loc("purpose")] = "A999"
+    cube = SegmentCube().update(odd)
+    assert cube.skipped == 1
+    assert cube.query(())["count"].tolist() == [9]
+
+def test_cube_rejects_unknown_dimension():
+    with pytest.raises(ValueError):
+        levels("color")
+    with pytest.raises(ValueError):
+        SegmentCube(("housing",)).query(("purpose",))
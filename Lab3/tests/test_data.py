@@ -0,0 +1,45 @@
+import io
+import json
+import pandas as pd
+import pytest
+from credit_analysis import data
+from credit_analysis.synthetic import synthetic_credit
+
+URL = "https://example.org/german.data"
+
+def raw_credit(n, seed):
+    return synthetic_credit(n, seed=seed).to_csv(sep=' ', header=False, index=False).encode()
+
+def offline(*args, **kwargs):
+    raise OSError("сеть недоступна")
+
+def test_url_cache_works_offline(tmp_path, monkeypatch):
+    raw = raw_credit(200, seed=1)
+    monkeypatch.setattr(data.urllib.request, "urlopen", lambda *args, **kwargs: io.BytesIO(raw))
+    first = data.load_german_credit(URL, cache_dir=tmp_path)
+
+    index = json.loads((tmp_path / "index.json").read_text(encoding="utf-8"))
+    assert list(index) == [URL]
+    assert data._cache_file(tmp_path, index[URL]).exists()
+
+    monkeypatch.setattr(data.urllib.request, "urlopen", offline)
+    again = data.load_german_credit(URL, cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(again, first)
+    pd.testing.assert_frame_equal(again, data.parse_german_credit(raw))
+
+    with pytest.raises(data.DataLoadError):
+        data.load_german_credit(URL + "?v=2", cache_dir=tmp_path)
+
+def test_changed_local_file_is_not_served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(data.urllib.request, "urlopen", offline)
+    source = tmp_path / "german.data"
+    cache_dir = tmp_path / "cache"
+    source.write_bytes(raw_credit(100, seed=1))
+    first = data.load_german_credit(str(source), cache_dir=cache_dir)
+    assert len(first) == 100
+
+    source.write_bytes(raw_credit(150, seed=2))
+    changed = data.load_german_credit(str(source), cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(changed, data.parse_german_credit(source.read_bytes()))
+    assert len(list(cache_dir.glob("*.parquet")) or list(cache_dir.glob("*.pkl"))) == 2
+    assert not (cache_dir / "index.json").exists()
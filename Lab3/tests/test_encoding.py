@@ -0,0 +1,20 @@
+import numpy as np
+from credit_analysis.data import CATEGORICAL_COLS
+from credit_analysis.encoding import CategoricalEncoder
+
+def test_encoder_roundtrip_with_unknown_level(credit_df):
+    encoder = CategoricalEncoder(CATEGORICAL_COLS).fit(credit_df)
+    assert encoder.categories_["housing"] == sorted(credit_df["housing"].unique().tolist())
+
+    new = credit_df.iloc[:5][["housing", "purpose"]].astype(object)
+    new.iloc[2, 0] = "A999"
+    codes = encoder.transform(new)
+    assert sorted(codes.columns) == ["housing", "purpose"]
+    assert codes["housing"].dtype == np.int8
+    assert codes["housing"].iat[2] == -1
+
+    restored = encoder.inverse_transform(codes)
+    assert restored["housing"].isna().tolist() == [False, False, True, False, False]
+    keep = [0, 1, 3, 4]
+    assert restored["housing"].iloc[keep].astype(object).tolist() == new["housing"].iloc[keep].tolist()
+    assert restored["purpose"].astype(object).tolist() == new["purpose"].tolist()
@@ -0,0 +1,56 @@
+import json
+import os
+import numpy as np
+import pytest
+from credit_analysis import plotting, stages
+
+pytest.importorskip("matplotlib")
+pytest.importorskip("seaborn")
+
+CHARTS = {"age_hist", "credit_box", "corr_heatmap", "purpose_counts"}
+
+def prepare(df):
+    df = df.copy()
+    df['credit_risk_label'] = df['credit_risk'].map({1: 'Good', 2: 'Bad'})
+    return df, stages.variables.__wrapped__(df)["encoded"]
+
+def mtimes(paths):
+    return {name: os.stat(path).st_mtime_ns for name, path in paths.items()}
+
+def test_chart_inputs(credit_df):
+    df, encoded = prepare(credit_df)
+    inputs = plotting.chart_inputs(df, encoded)
+
+    assert set(inputs) == CHARTS
+    assert inputs["age_hist"]["counts"].sum() == len(df)
+    assert [s["label"] for s in inputs["credit_box"]["stats"]] == list(df['credit_risk_label'].unique())
+    box = inputs["credit_box"]["stats"][0]
+    assert box["whislo"] <= box["q1"] <= box["med"] <= box["q3"] <= box["whishi"]
+    assert np.allclose(np.diag(inputs["corr_heatmap"]["corr"]), 1.0)
+    assert inputs["purpose_counts"]["counts"].sum() == len(df)
+
+def test_render_all_skips_unchanged_charts(tmp_path, credit_df, monkeypatch):
+    df, encoded = prepare(credit_df)
+    out_dir = str(tmp_path / "charts")
+    paths = plotting.render_all(df, encoded, out_dir, max_workers=1)
+
+    assert set(paths) == CHARTS
+    assert all(os.path.getsize(p) > 0 for p in paths.values())
+    with open(os.path.join(out_dir, plotting.MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert set(manifest) == {f"{name}.png" for name in CHARTS}
+
+    before = mtimes(paths)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("неизменённые графики перерисованы")
+    with monkeypatch.context() as m:
+        m.setattr(plotting, "ProcessPoolExecutor", no_pool)
+        assert plotting.render_all(df, encoded, out_dir, max_workers=1) == paths
+    assert mtimes(paths) == before
+
+    df.loc[df.index[:100], 'credit_amount'] += 1000
+    encoded = prepare(df.drop(columns='credit_risk_label'))[1]
+    plotting.render_all(df, encoded, out_dir, max_workers=1)
+    after = mtimes(paths)
+    assert {name for name in CHARTS if after[name] != before[name]} == {"credit_box", "corr_heatmap"}
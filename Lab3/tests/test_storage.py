@@ -0,0 +1,16 @@
+from credit_analysis import storage
+from credit_analysis.synthetic import synthetic_credit
+
+def test_append_clients_skips_loaded_batch(credit_df):
+    conn = storage.connect()
+    try:
+        assert storage.append_clients(conn, credit_df, batch_size=1000) == len(credit_df)
+        assert storage.append_clients(conn, credit_df) == 0
+        other = synthetic_credit(100, seed=8)
+        assert storage.append_clients(conn, other) == 100
+        assert conn.execute("SELECT COUNT(*) FROM clients;").fetchone()[0] == len(credit_df) + 100
+
+        top = storage.report(conn)["top_credits"]
+        assert top[0][2] == max(credit_df["credit_amount"].max(), other["credit_amount"].max())
+    finally:
+        conn.close()
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from credit_analysis import stages
+from credit_analysis.data import NUMERICAL_COLS, CATEGORICAL_COLS
+from credit_analysis.streaming import Moments, QuantileSketch, StreamingReport
+
+def chunks(df, size):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+def test_moments_chunked_and_merged_match_dataframe(credit_df):
+    cols = NUMERICAL_COLS + ['credit_risk']
+    x = credit_df[cols].to_numpy(dtype=np.float64)
+    left, right = Moments(cols), Moments(cols)
+    for part in np.array_split(x[:1700], 3):
+        left.update(part)
+    for part in np.array_split(x[1700:], 4):
+        right.update(part)
+    left.merge(right)
+
+    expected = credit_df[cols].astype(np.float64)
+    assert left.n == len(credit_df)
+    assert np.allclose(left.mean, expected.mean())
+    assert np.allclose(left.std(), expected.std())
+    assert np.array_equal(left.min, expected.min()) and np.array_equal(left.max, expected.max())
+    pd.testing.assert_frame_equal(left.corr(), expected.corr(), check_exact=False, atol=1e-12)
+
+def test_sketch_exact_for_integers():
+    values = np.random.default_rng(1).integers(19, 76, 5000).astype(np.float64)
+    sketch = QuantileSketch()
+    sketch.update(values)
+    for q in (0.0, 0.25, 0.5, 0.75, 1.0):
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q))
+
+def test_sketch_quantiles_within_bin_width():
+    rng = np.random.default_rng(2)
+    a, b = rng.integers(250, 18425, 4000), rng.integers(250, 18425, 3000)
+    sketch, other = QuantileSketch(max_bins=64), QuantileSketch(max_bins=256)
+    sketch.update(a.astype(np.float64))
+    other.update(b.astype(np.float64))
+    sketch.merge(other)
+
+    values = np.concatenate([a, b])
+    assert len(sketch.counts) <= 64 and sketch.width > 1
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        assert abs(sketch.quantile(q) - np.quantile(values, q)) <= sketch.width
+
+def test_streaming_report_merge_matches_stages(credit_df):
+    df = credit_df.copy()
+    df['credit_risk_label'] = df['credit_risk'].map({1: 'Good', 2: 'Bad'})
+    first, second = StreamingReport(), StreamingReport()
+    for chunk in chunks(credit_df, 700)[:2]:
+        first.update(chunk)
+    for chunk in chunks(credit_df, 700)[2:]:
+        second.update(chunk)
+    first.merge(second)
+
+    expected = stages.variables.__wrapped__(df)
+    cols = NUMERICAL_COLS + CATEGORICAL_COLS + ['credit_risk']
+    assert first.rows == len(df)
+    pd.testing.assert_frame_equal(first.moments.corr(), expected["encoded"][cols].corr(),
+                                  check_exact=False, atol=1e-12)
+    described = first.describe()
+    for row in ('count', 'mean', 'std', 'min', 'max'):
+        assert np.allclose(described.loc[row], expected["describe"].loc[row])
+    assert described.loc['50%', 'age'] == expected["describe"].loc['50%', 'age']
+    assert first.variables()["uniques"] == expected["uniques"]
+    assert all(type(values) is list for values, _ in expected["uniques"].values())
+    risk = first.relations()["grouped_risk"]
+    assert np.allclose(risk.loc['Bad'], df[df['credit_risk'] == 2][['credit_amount', 'age']].mean())